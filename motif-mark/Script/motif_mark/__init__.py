@@ -0,0 +1,37 @@
+"""Find IUPAC motifs in FASTA records and draw or export their locations.
+
+    >>> from motif_mark import Motifs, Sequence, read_fasta
+    >>> scanner = Motifs.from_file('motifs.txt').matcher()
+    >>> for name, seq in read_fasta('genes.fa'):
+    ...     record = Sequence(name, seq)
+    ...     record.motif_locations(scanner)
+
+Importing the package does not import cairo; `Plot` and the page renderers
+load it on first access.
+"""
+from .cli import main
+from .encoded_sequence import Sequence
+from .exons import classify_hits
+from .export import FORMATS, ExonSummary, HitWriter
+from .fasta_index import IndexedFasta, scan_regions
+from .fasta_reader import read_fasta
+from .motif_cache import MatcherCache
+from .motif_scan import BitmaskMatcher, MotifScanner, scan_records
+from .motifs import IUPAC_dict, Motifs, build_matcher, expand_motif, read_motifs
+from .result_cache import CachedScanner
+
+_PLOT_NAMES = ('Plot', 'PALETTE', 'render_pages')
+
+
+def __getattr__(name):
+    if name in _PLOT_NAMES:
+        from . import plot
+        return getattr(plot, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    'BitmaskMatcher', 'CachedScanner', 'ExonSummary', 'FORMATS', 'HitWriter', 'IUPAC_dict', 'IndexedFasta', 'MatcherCache',
+    'MotifScanner', 'Motifs', 'Sequence', 'build_matcher', 'classify_hits', 'expand_motif', 'main', 'read_fasta', 'read_motifs',
+    'scan_records', 'scan_regions',
+]  # the lazy plot names stay out, so `import *` does not pull in cairo
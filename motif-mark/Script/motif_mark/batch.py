@@ -0,0 +1,216 @@
+"""Run many FASTA x motif-file jobs from one manifest, scanning each FASTA once for all of its jobs.
+
+    python -m motif_mark.batch jobs.json
+
+The manifest is JSON. Top-level `matcher`, `both_strands`, `plot_format` and
+`result_cache` apply to every job; each entry of `jobs` names a `fasta` and a
+`motifs` file and may set `prefix` (figure path without extension), `plot`
+(default true), `plot_format`, `format` and `output` for a coordinate export,
+and `exon_summary`. Relative paths are resolved against the manifest's
+directory.
+
+Jobs that share a FASTA are merged: the file is parsed and encoded once and
+scanned once with the union of their motif sets, and each record's hits are
+split back out to every job's figure, export and summary. With
+`result_cache`, records that repeat across FASTA files are scanned once too.
+"""
+import argparse
+import functools
+import json
+import logging
+import os
+import sys
+
+from .encoded_sequence import Sequence
+from .export import FORMATS, ExonSummary, HitWriter
+from .fasta_reader import read_fasta
+from .motif_cache import MatcherCache, default_cache_dir
+from .motif_scan import scan_records
+from .motifs import MATCHERS, Motifs, build_matcher
+from .render import PAGE_FORMATS
+from .result_cache import CachedScanner
+from .run_stats import RunStats
+
+SETTINGS = {'matcher': 'auto', 'both_strands': False, 'plot_format': 'svg', 'result_cache': None}
+JOB_KEYS = {'fasta', 'motifs', 'prefix', 'plot', 'plot_format', 'format', 'output', 'exon_summary'}
+
+
+def restrict(seq, motifs):
+    """Return a hits-only view of a scanned record holding just `motifs`, in that order."""
+    minus_hits = {m: seq.minus_hits[m] for m in motifs} if seq.minus_hits else {}
+    return Sequence.from_parts(seq.name, seq.length, seq.exon_mask, {m: seq.hits[m] for m in motifs},
+                               minus_hits, seqid=seq.seqid, offset=seq.offset)
+
+
+class Job:
+    """One FASTA x motif-file job of a manifest and the outputs it writes."""
+
+    def __init__(self, spec, base, plot_format):
+        unknown = set(spec) - JOB_KEYS
+        if unknown:
+            raise ValueError(f"unknown job keys: {', '.join(sorted(unknown))}")
+        if 'fasta' not in spec or 'motifs' not in spec:
+            raise ValueError("every job needs 'fasta' and 'motifs'")
+
+        def resolve(path):
+            return path if path in (None, '-') else os.path.join(base, path)
+        self.fasta = resolve(spec['fasta'])
+        self.motif_file = resolve(spec['motifs'])
+        default_prefix = '{}_{}'.format(self.fasta.removesuffix('.gz').rsplit('.', 1)[0],
+                                        os.path.splitext(os.path.basename(self.motif_file))[0])
+        self.prefix = resolve(spec.get('prefix')) or default_prefix
+        self.plot = spec.get('plot', True)
+        self.plot_format = spec.get('plot_format', plot_format)
+        if self.plot_format not in PAGE_FORMATS:
+            raise ValueError(f"Unknown plot format: {self.plot_format}")
+        self.format = spec.get('format')
+        if self.format is not None and self.format not in FORMATS:
+            raise ValueError(f"Unknown export format: {self.format}")
+        self.output = resolve(spec.get('output')) or (f"{self.prefix}.{self.format}" if self.format else None)
+        self.exon_summary = resolve(spec.get('exon_summary'))
+        if not (self.plot or self.format or self.exon_summary):
+            raise ValueError(f"job {self.fasta} x {self.motif_file} has no output")
+        self.motifs = None
+        self._plot = self._writer = self._summary = None
+
+    def outputs(self):
+        """Return the files this job will write (stdout, '-', is not a file)."""
+        paths = [f"{self.prefix}.{self.plot_format}"] if self.plot else []
+        if self.format:
+            paths.append(self.output)
+        paths.append(self.exon_summary)
+        return [path for path in paths if path not in (None, '-')]
+
+    def open(self, motifs):
+        """Create this job's outputs for its (already read) motif set."""
+        self.motifs = motifs
+        if self.plot:
+            from .plot import PALETTE, Plot  # cairo is only imported when some job draws
+            self._plot = Plot(1200, f"{self.prefix}.{self.plot_format}", self.plot_format)
+            self._plot.assign_colors(motifs, PALETTE[:len(motifs)])
+        if self.format:
+            self._writer = HitWriter(self.output, self.format)
+        if self.exon_summary:
+            self._summary = ExonSummary(self.exon_summary)
+
+    def write(self, seq, stats):
+        """Pass one record of the combined scan, cut down to this job's motifs, to each output."""
+        view = restrict(seq, self.motifs.motifs)
+        with stats.stage("export"):
+            for out in (self._writer, self._summary):
+                if out:
+                    out.write(view)
+        if self._plot:
+            with stats.stage("render"):
+                self._plot.draw([view])
+
+    def close(self, stats):
+        """Finish every output and return the paths written."""
+        written = []
+        if self._plot:
+            with stats.stage("render"):
+                self._plot.draw_legend(self.motifs)
+                self._plot.save()
+                stats.shapes += self._plot.shapes
+            written.append(self._plot.filename)
+        with stats.stage("export"):
+            for out, path in ((self._writer, self.output), (self._summary, self.exon_summary)):
+                if out:
+                    out.close()
+                    if path != '-':
+                        written.append(path)
+        return written
+
+
+def read_manifest(path):
+    """Return (settings, jobs) from a JSON manifest."""
+    with open(path) as f:
+        manifest = json.load(f)
+    unknown = set(manifest) - set(SETTINGS) - {'jobs'}
+    if unknown:
+        raise ValueError(f"unknown manifest keys: {', '.join(sorted(unknown))}")
+    settings = {key: manifest.get(key, default) for key, default in SETTINGS.items()}
+    if settings['matcher'] not in MATCHERS:
+        raise ValueError(f"Unknown matcher: {settings['matcher']}")
+    base = os.path.dirname(os.path.abspath(path))
+    if settings['result_cache']:
+        settings['result_cache'] = os.path.join(base, settings['result_cache'])
+    jobs = [Job(spec, base, settings['plot_format']) for spec in manifest.get('jobs', [])]
+    if not jobs:
+        raise ValueError(f"{path} lists no jobs")
+    claimed = {}
+    for job in jobs:
+        for output in job.outputs():
+            other = claimed.setdefault(os.path.realpath(output), job)
+            if other is not job:
+                raise ValueError(f"jobs {other.fasta} x {other.motif_file} and {job.fasta} x {job.motif_file} "
+                                 f"both write {output}; set 'prefix' or 'output' on one of them")
+    return settings, jobs
+
+
+def run_batch(settings, jobs, cache=None, workers=1, stats=None):
+    """Run every job, scanning each distinct FASTA once with the union of its jobs' motifs.
+
+    Returns the list of files written.
+    """
+    stats = RunStats() if stats is None else stats
+    cache = MatcherCache() if cache is None else cache
+    motif_sets = {}
+    by_fasta = {}
+    for job in jobs:
+        if job.motif_file not in motif_sets:
+            motif_sets[job.motif_file] = Motifs.from_file(job.motif_file)
+        by_fasta.setdefault(os.path.realpath(job.fasta), []).append(job)
+
+    written = []
+    for group in by_fasta.values():
+        for job in group:
+            job.open(motif_sets[job.motif_file])
+        combined = Motifs(dict.fromkeys(m for job in group for m in job.motifs))
+        stats.variants.update(combined.variant_counts())
+        with stats.stage("compile"):
+            scanner = combined.matcher(settings['matcher'], settings['both_strands'], cache)
+            if settings['result_cache']:
+                scanner = CachedScanner(scanner, functools.partial(build_matcher, kind=settings['matcher'],
+                                                                   both_strands=settings['both_strands']),
+                                        settings['result_cache'])
+        records = stats.timed_iter("parse", read_fasta(group[0].fasta))
+        sequences = (Sequence(name, seq) for name, seq in records)
+        scanned = stats.count_records(stats.timed_iter("scan", scan_records(sequences, scanner, workers)))
+        for seq in scanned:
+            seq.codes = None  # only the hits and exon mask are passed on to the jobs
+            for job in group:
+                job.write(seq, stats)
+        stats.bytes_read += os.path.getsize(group[0].fasta)
+        for job in group:
+            written.extend(job.close(stats))
+    return written
+
+
+def get_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a manifest of FASTA x motif-file jobs, scanning each FASTA once")
+    parser.add_argument("manifest", help="JSON manifest of jobs")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes used to scan records in parallel")
+    parser.add_argument("--cache-dir", default=default_cache_dir(), help="directory of the compiled-motif cache")
+    parser.add_argument("--no-cache", action="store_true", help="always compile the motif sets instead of loading them from the cache")
+    parser.add_argument("--stats-json", help="write per-stage timings, peak RSS and run counters as JSON to this file ('-' for stderr)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = get_args(argv)
+    stats = RunStats()
+    try:
+        settings, jobs = read_manifest(args.manifest)
+    except (ValueError, OSError) as e:
+        sys.exit(f"{args.manifest}: {e}")
+    cache = MatcherCache(None if args.no_cache else args.cache_dir)
+    for filename in run_batch(settings, jobs, cache, args.workers, stats):
+        logging.info("wrote %s", filename)
+    if args.stats_json:
+        stats.write_json(args.stats_json)
+
+
+if __name__ == "__main__":
+    main()
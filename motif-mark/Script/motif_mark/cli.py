@@ -0,0 +1,125 @@
+"""Command-line entry point: scan a FASTA for motifs, then plot and/or export the hits."""
+import argparse
+import functools
+import logging
+import os
+import sys
+
+from .encoded_sequence import Sequence
+from .export import FORMATS, ExonSummary, HitWriter
+from .fasta_index import check_regions, scan_regions
+from .fasta_reader import read_fasta
+from .motif_cache import MatcherCache, default_cache_dir
+from .motif_scan import scan_records
+from .motifs import MATCHERS, Motifs, build_matcher
+from .render import PAGE_FORMATS
+from .result_cache import CachedScanner
+from .run_stats import RunStats
+
+
+def get_args(argv=None, **defaults):
+    """Parse argv (default sys.argv[1:]); keyword arguments override option defaults."""
+    parser = argparse.ArgumentParser(description="Visualize motifs on gene sequences")
+    parser.add_argument("-f", required=True, help="FASTA file with sequences")
+    parser.add_argument("-m", required=True, help="Motifs file")
+    parser.add_argument("--matcher", choices=MATCHERS, default="auto",
+                        help="bitmask matches IUPAC codes position by position with NumPy; automaton expands every variant "
+                             "into one Aho-Corasick pass, which wins only for very large motif sets; auto picks between them")
+    parser.add_argument("--workers", type=int, default=1, help="number of processes used to scan records in parallel")
+    parser.add_argument("--cache-dir", default=default_cache_dir(), help="directory of the compiled-motif cache")
+    parser.add_argument("--no-cache", action="store_true", help="always compile the motif set instead of loading it from the cache")
+    parser.add_argument("--result-cache", help="SQLite file of per-record, per-motif hits; reruns only scan new record x motif pairs")
+    parser.add_argument("--both-strands", action="store_true", help="also report reverse-complement hits, drawn on a separate minus-strand track")
+    parser.add_argument("--format", choices=FORMATS, help="stream hit coordinates in this format as each record is scanned")
+    parser.add_argument("-o", "--output", default="-", help="file for --format output (default: stdout)")
+    parser.add_argument("--exon-summary", help="write per-record and per-motif exon/intron/junction hit counts as TSV to this file ('-' for stdout)")
+    parser.add_argument("--no-plot", action="store_true", help="skip rendering; only useful with --format or --exon-summary")
+    parser.add_argument("--page-size", type=int, help="records per page; pages are rendered in parallel with --workers")
+    parser.add_argument("--plot-format", "--page-format", dest="plot_format", choices=PAGE_FORMATS, default="svg",
+                        help="figure format; with --page-size, numbered svg/png files or one multi-page pdf")
+    parser.add_argument("--stats-json", help="write per-stage timings, peak RSS and run counters as JSON to this file ('-' for stderr)")
+    parser.add_argument("--profile", help="write cProfile stats of the scan stage to this file (scanning in --workers processes is not profiled)")
+    parser.add_argument("--region", action="append", help="scan only this record or chr:start-end region through a .fai index (repeatable)")
+    parser.add_argument("--window", type=int, default=1 << 20, help="bases scanned per window in --region mode")
+    parser.set_defaults(**defaults)
+    args = parser.parse_args(argv)
+    if args.no_plot and not (args.format or args.exon_summary):
+        parser.error("--no-plot needs --format or --exon-summary, otherwise there is no output")
+    return args
+
+
+def run(args):
+    """Run the scan/plot/export pipeline for parsed arguments."""
+    stats = RunStats(profile_stage="scan" if args.profile else None)
+    motifs = Motifs.from_file(args.m)
+    stats.variants = motifs.variant_counts()
+    with stats.stage("compile"):
+        cache = MatcherCache(None if args.no_cache else args.cache_dir)
+        scanner = motifs.matcher(args.matcher, args.both_strands, cache)
+        if args.result_cache:
+            scanner = CachedScanner(scanner, functools.partial(build_matcher, kind=args.matcher, both_strands=args.both_strands),
+                                    args.result_cache)
+    prefix = args.f.removesuffix('.gz').rsplit('.', 1)[0]
+
+    if args.region:
+        scanned = stats.timed_iter("scan", scan_regions(args.f, args.region, scanner, args.window))
+    else:
+        records = stats.timed_iter("parse", read_fasta(args.f))
+        sequences = (Sequence(name, seq) for name, seq in records)
+        scanned = stats.timed_iter("scan", scan_records(sequences, scanner, args.workers))
+        stats.bytes_read = os.path.getsize(args.f)
+    scanned = stats.count_records(scanned)
+
+    writer = HitWriter(args.output, args.format) if args.format else None
+    if writer:
+        scanned = stats.timed_iter("export", writer.passthrough(scanned))
+    summary = ExonSummary(args.exon_summary) if args.exon_summary else None
+    if summary:
+        scanned = stats.timed_iter("export", summary.passthrough(scanned))
+    if args.no_plot:
+        for _ in scanned:
+            pass
+    else:
+        with stats.stage("render"):
+            # cairo is only imported once there is something to draw
+            from .plot import PALETTE, Plot, render_pages
+            palette = PALETTE[:len(motifs)]
+            if args.page_size:
+                for filename, shapes in render_pages(scanned, args.page_size, args.plot_format, prefix,
+                                                     motifs.motifs, palette, args.workers):
+                    stats.shapes += shapes
+                    logging.info("wrote %s", filename)
+            else:
+                plot = Plot(1200, f"{prefix}.{args.plot_format}", args.plot_format)
+                plot.assign_colors(motifs, palette)
+                plot.draw(scanned)
+                plot.draw_legend(motifs)
+                plot.save()
+                stats.shapes += plot.shapes
+    with stats.stage("export"):
+        for out in (writer, summary):
+            if out:
+                out.close()
+    if args.region:
+        stats.bytes_read = stats.bases
+    if args.stats_json:
+        stats.write_json(args.stats_json)
+    if args.profile:
+        stats.write_profile(args.profile)
+
+
+def main(argv=None, **defaults):
+    """Main execution function to run the motif visualization pipeline."""
+    logging.basicConfig(level=logging.INFO)
+    args = get_args(argv, **defaults)
+    if args.region:
+        try:
+            check_regions(args.f, args.region)
+        except (OSError, ValueError) as e:
+            sys.exit(f"motif-mark: {e}")
+    try:
+        run(args)
+    except BrokenPipeError:
+        # downstream of a pipeline closed early (e.g. `| head`); exit quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
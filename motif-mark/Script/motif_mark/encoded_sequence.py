@@ -0,0 +1,70 @@
+"""Compact, bit-encoded sequence records shared by the motif-mark scripts."""
+import numpy as np
+
+from .exons import classify_hits, exon_intervals
+from .motif_scan import encode_bases
+
+
+def pack_exon_mask(raw):
+    """Pack the exon (uppercase) positions of raw ASCII bases into bits, eight bases per byte."""
+    return np.packbits((raw >= ord('A')) & (raw <= ord('Z')))
+
+
+class Sequence:
+    """A FASTA record held as encoded bases plus a packed exon (uppercase) mask.
+
+    The raw string is not kept: bases are stored one uint8 of base bits each
+    (see `motif_scan.encode_bases`), the exon/intron case is packed eight
+    positions per byte, and motif hits are stored as parallel int32
+    (starts, ends) arrays per motif, with minus-strand hits kept separately.
+    `seqid` is the first word of the header and `offset` the position of base 0
+    within that record (non-zero for --region scans), for coordinate exports.
+    """
+    __slots__ = ('name', 'seqid', 'offset', 'length', 'codes', 'exon_mask', 'hits', 'minus_hits')
+
+    def __init__(self, name, seq):
+        raw = np.frombuffer(seq.encode('ascii') if isinstance(seq, str) else seq, dtype=np.uint8)
+        self.name = name
+        self.seqid = name.split(None, 1)[0] if name.strip() else name
+        self.offset = 0
+        self.length = len(raw)
+        self.codes = encode_bases(raw)
+        self.exon_mask = pack_exon_mask(raw)
+        self.hits = {}
+        self.minus_hits = {}
+
+    @classmethod
+    def from_parts(cls, name, length, exon_mask, hits, minus_hits=None, seqid=None, offset=0):
+        """Build an already-scanned record without encoded bases (e.g. from a windowed region scan)."""
+        seq = cls.__new__(cls)
+        seq.name = name
+        seq.seqid = name if seqid is None else seqid
+        seq.offset = offset
+        seq.length = length
+        seq.codes = None
+        seq.exon_mask = exon_mask
+        seq.hits = hits
+        seq.minus_hits = minus_hits or {}
+        return seq
+
+    def __len__(self):
+        return self.length
+
+    def is_exon(self):
+        """Unpack the exon mask into one bool per base."""
+        return np.unpackbits(self.exon_mask, count=self.length).view(bool)
+
+    def exons(self):
+        """Return (starts, ends) int32 arrays of every exonic (uppercase) run, in order."""
+        return exon_intervals(self.is_exon())
+
+    def hit_locations(self):
+        """Return ({motif: tags}, {motif: tags}) tagging each plus/minus hit as exons.INTRON, EXON or JUNCTION."""
+        exon_starts, exon_ends = self.exons()
+        return tuple({motif: classify_hits(starts, ends, exon_starts, exon_ends) for motif, (starts, ends) in hits.items()}
+                     for hits in (self.hits, self.minus_hits))
+
+    def motif_locations(self, scanner):
+        """Scan the encoded bases once and store {motif: (starts, ends)} per strand on the record."""
+        self.hits, self.minus_hits = scanner.scan(self.codes)
+        return self.hits
@@ -0,0 +1,38 @@
+"""Exon/intron structure from the case mask, and per-hit exon, intron or junction tags."""
+import numpy as np
+
+INTRON, EXON, JUNCTION = 0, 1, 2
+
+
+def exon_intervals(is_exon):
+    """Return (starts, ends) int32 arrays of every run of True in a per-base bool mask."""
+    edges = np.diff(is_exon.astype(np.int8), prepend=0, append=0)
+    return np.flatnonzero(edges == 1).astype(np.int32), np.flatnonzero(edges == -1).astype(np.int32)
+
+
+def classify_hits(starts, ends, exon_starts, exon_ends):
+    """Tag each [start, end) hit as INTRON, EXON or JUNCTION against sorted, disjoint exons.
+
+    One searchsorted finds, for every hit, the first exon ending after the hit
+    starts; that is the only exon the hit can lie inside or share bases with
+    first. A hit inside it is exonic, one that overlaps it without fitting is
+    junction-spanning, and one that ends before it begins is intronic.
+    """
+    tags = np.full(len(starts), INTRON, dtype=np.int8)
+    if not len(starts) or not len(exon_starts):
+        return tags
+    first = np.searchsorted(exon_ends, starts, side='right')
+    has_exon = first < len(exon_starts)
+    idx = np.minimum(first, len(exon_starts) - 1)
+    overlaps = has_exon & (exon_starts[idx] < ends)
+    inside = overlaps & (exon_starts[idx] <= starts) & (ends <= exon_ends[idx])
+    tags[overlaps] = JUNCTION
+    tags[inside] = EXON
+    return tags
+
+
+def location_counts(hits, exon_starts, exon_ends):
+    """Return {motif: [intron, exon, junction] hit counts} for one strand's hits."""
+    return {motif: np.bincount(classify_hits(starts, ends, exon_starts, exon_ends), minlength=3).tolist()
+            for motif, (starts, ends) in hits.items()}
+
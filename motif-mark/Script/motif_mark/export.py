@@ -0,0 +1,104 @@
+"""Stream motif hits as BED, GFF3 or TSV, and exon/intron hit counts as TSV, one record at a time."""
+import os
+import sys
+
+from .exons import location_counts
+
+FORMATS = ('bed', 'gff3', 'tsv')
+
+
+class _RecordSink:
+    """Base for outputs written one scanned record at a time, with one buffered write per record.
+
+    `path` may be a file name, '-' or None for stdout, or an open text stream;
+    only files opened here are closed by close().
+    """
+
+    def __init__(self, path):
+        self._owns_file = isinstance(path, (str, bytes, os.PathLike)) and path != '-'
+        if self._owns_file:
+            self.out = open(path, 'w', buffering=1 << 20)
+        else:
+            self.out = sys.stdout if path in (None, '-') else path
+
+    def write(self, seq):
+        raise NotImplementedError
+
+    def passthrough(self, sequences):
+        """Write each scanned record as it goes by and yield it on (e.g. to the plot)."""
+        for seq in sequences:
+            self.write(seq)
+            yield seq
+
+    def close(self):
+        if self._owns_file:
+            self.out.close()
+        else:
+            self.out.flush()
+
+
+class HitWriter(_RecordSink):
+    """Write each scanned Sequence's hits as soon as it is scanned.
+
+    Coordinates are taken from the record's `seqid` and shifted by its
+    `offset`, so hits from a --region scan come out in record coordinates.
+    BED and TSV use 0-based half-open intervals; GFF3 is 1-based inclusive.
+    """
+
+    def __init__(self, path, fmt):
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        super().__init__(path)
+        self.fmt = fmt
+        if fmt == 'gff3':
+            self.out.write('##gff-version 3\n')
+        elif fmt == 'tsv':
+            self.out.write('seqid\tmotif\tstrand\tstart\tend\n')
+
+    def _lines(self, seq, strand, hits):
+        seqid = seq.seqid
+        for motif, (starts, ends) in hits.items():
+            starts = (starts + seq.offset).tolist()
+            ends = (ends + seq.offset).tolist()
+            if self.fmt == 'bed':
+                yield from (f'{seqid}\t{s}\t{e}\t{motif}\t0\t{strand}\n' for s, e in zip(starts, ends))
+            elif self.fmt == 'gff3':
+                yield from (f'{seqid}\tmotif-mark\tsequence_motif\t{s + 1}\t{e}\t.\t{strand}\t.\tName={motif}\n'
+                            for s, e in zip(starts, ends))
+            else:
+                yield from (f'{seqid}\t{motif}\t{strand}\t{s}\t{e}\n' for s, e in zip(starts, ends))
+
+    def write(self, seq):
+        """Write all plus- and minus-strand hits of one scanned record."""
+        self.out.write(''.join(self._lines(seq, '+', seq.hits)))
+        self.out.write(''.join(self._lines(seq, '-', seq.minus_hits)))
+
+
+class ExonSummary(_RecordSink):
+    """Write per-record and per-motif exon/intron/junction hit counts as TSV.
+
+    One row per record, motif and strand is written as each record goes by;
+    per-motif totals over all records (seqid `*`) are written on close().
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.out.write('seqid\tmotif\tstrand\texons\tintron\texon\tjunction\n')
+        self.totals = {}
+
+    def write(self, seq):
+        """Write the location counts of one scanned record."""
+        exon_starts, exon_ends = seq.exons()
+        lines = []
+        for strand, hits in (('+', seq.hits), ('-', seq.minus_hits)):
+            for motif, counts in location_counts(hits, exon_starts, exon_ends).items():
+                total = self.totals.setdefault((motif, strand), [0, 0, 0])
+                for i, n in enumerate(counts):
+                    total[i] += n
+                lines.append(f'{seq.seqid}\t{motif}\t{strand}\t{len(exon_starts)}\t' + '\t'.join(map(str, counts)) + '\n')
+        self.out.write(''.join(lines))
+
+    def close(self):
+        for (motif, strand), counts in self.totals.items():
+            self.out.write(f'*\t{motif}\t{strand}\t.\t' + '\t'.join(map(str, counts)) + '\n')
+        super().close()
@@ -0,0 +1,188 @@
+"""Indexed (.fai), memory-mapped FASTA access with windowed region scanning."""
+import mmap
+import os
+import re
+from collections import namedtuple
+
+import numpy as np
+
+from .encoded_sequence import Sequence, pack_exon_mask
+from .fasta_reader import GZIP_MAGIC
+from .motif_scan import encode_bases
+
+# one line of a samtools-style .fai index
+FaiEntry = namedtuple('FaiEntry', ['name', 'length', 'offset', 'linebases', 'linewidth'])
+
+# record names may contain ':' themselves (e.g. HLA-A*01:01), so only a trailing :start[-end] is a range
+REGION_RE = re.compile(r'^(?P<name>.+?)(?::(?P<start>[\d,]+)(?:-(?P<end>[\d,]+))?)?$')
+
+
+def build_fai(filepath, fai_path=None):
+    """Write a .fai index for an uncompressed FASTA and return its entries."""
+    fai_path = fai_path or filepath + '.fai'
+    entries = []
+    with open(filepath, 'rb') as f:
+        if f.read(2) == GZIP_MAGIC:
+            raise ValueError(f"{filepath}: indexed access needs an uncompressed FASTA")
+        f.seek(0)
+        name = None
+        offset = length = linebases = linewidth = 0
+        short_line = False  # a short line is only allowed as the last line of a record
+        pos = 0
+        for line in f:
+            if line.startswith(b'>'):
+                if name is not None:
+                    entries.append(FaiEntry(name, length, offset, linebases, linewidth))
+                name = line[1:].split(None, 1)[0].decode() if line[1:].strip() else ''
+                offset = pos + len(line)
+                length = linebases = linewidth = 0
+                short_line = False
+            elif name is not None:
+                bases = len(line.rstrip(b'\r\n'))
+                if bases:
+                    if short_line or (linebases and bases > linebases):
+                        raise ValueError(f"{filepath}: record {name} has uneven line lengths and cannot be indexed")
+                    if not linebases:
+                        linebases, linewidth = bases, len(line)
+                    elif bases < linebases:
+                        short_line = True
+                    length += bases
+                elif linebases:
+                    short_line = True
+            pos += len(line)
+        if name is not None:
+            entries.append(FaiEntry(name, length, offset, linebases, linewidth))
+    with open(fai_path, 'w') as out:
+        for entry in entries:
+            out.write('\t'.join(str(field) for field in entry) + '\n')
+    return entries
+
+
+def read_fai(filepath):
+    """Load the .fai index next to a FASTA, building it if it is missing or older than the FASTA."""
+    fai_path = filepath + '.fai'
+    if not os.path.exists(fai_path) or os.path.getmtime(fai_path) < os.path.getmtime(filepath):
+        entries = build_fai(filepath, fai_path)
+    else:
+        with open(fai_path) as f:
+            entries = [FaiEntry(fields[0], *map(int, fields[1:5]))
+                       for fields in (line.rstrip('\n').split('\t') for line in f) if len(fields) >= 5]
+    return {entry.name: entry for entry in entries}
+
+
+def _concat(arrays):
+    return np.concatenate(arrays).astype(np.int32) if arrays else np.zeros(0, dtype=np.int32)
+
+
+def parse_region(region, names=()):
+    """Parse 'name', 'name:start' or 'name:start-end' (1-based, inclusive) into (name, start, end) 0-based half-open.
+
+    As in samtools, a region that is itself one of `names` (e.g. the .fai
+    index) is that whole record, even if it contains ':'; only otherwise is a
+    trailing :start[-end] split off.
+    """
+    region = region.strip()
+    if region in names:
+        return region, 0, None
+    match = REGION_RE.match(region)
+    if not match or (match.group('start') is None and ':' in match.group('name')):
+        raise ValueError(f"Invalid region: {region}")
+    start = int(match.group('start').replace(',', '')) if match.group('start') else 1
+    end = int(match.group('end').replace(',', '')) if match.group('end') else None
+    if start < 1:
+        raise ValueError(f"Invalid region: {region} (positions are 1-based)")
+    if end is not None and end < start:
+        raise ValueError(f"Invalid region: {region} (end is before start)")
+    return match.group('name'), start - 1, end
+
+
+class IndexedFasta:
+    """Random access to FASTA records through a .fai index and a read-only mmap of the file."""
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.index = read_fai(filepath)
+        self._file = open(filepath, 'rb')
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if os.path.getsize(filepath) else b''
+
+    def close(self):
+        if isinstance(self._mmap, mmap.mmap):
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _file_offset(self, entry, pos):
+        return entry.offset + (pos // entry.linebases) * entry.linewidth + pos % entry.linebases
+
+    def fetch(self, name, start=0, end=None):
+        """Return the raw bases of name[start:end] as a uint8 array, read straight from the mapped file."""
+        if start < 0:
+            raise ValueError(f"Negative start {start} for {name}")
+        entry = self.index[name]
+        end = entry.length if end is None else min(end, entry.length)
+        if start >= end:
+            return np.zeros(0, dtype=np.uint8)
+        raw = np.frombuffer(self._mmap, dtype=np.uint8,
+                            count=self._file_offset(entry, end - 1) + 1 - self._file_offset(entry, start),
+                            offset=self._file_offset(entry, start))
+        return raw[(raw != ord('\n')) & (raw != ord('\r'))]  # boolean indexing copies out of the map
+
+    def region_bounds(self, region):
+        """Resolve a region string into (name, start, end) clipped to the record."""
+        name, start, end = parse_region(region, self.index)
+        if name not in self.index:
+            raise ValueError(f"{name} is not in {self.filepath}.fai")
+        length = self.index[name].length
+        return name, min(start, length), length if end is None else min(end, length)
+
+    def scan_region(self, region, scanner, window=1 << 20):
+        """Scan a region in fixed-size windows and return a Sequence holding its hits and exon mask.
+
+        Consecutive windows overlap by the scanner's longest motif length minus
+        one, so a hit that straddles a window edge is still found, and it is
+        kept only by the window it starts in. Memory stays bounded by the window
+        size; the returned Sequence keeps no encoded bases, only the packed
+        exon mask and the hit arrays, in region-relative coordinates.
+        """
+        name, start, end = self.region_bounds(region)
+        window = max(8, window - window % 8)  # keep packed exon-mask chunks byte aligned
+        overlap = max(scanner.max_length - 1, 0)
+        # per strand, per motif: lists of start/end array chunks, one per window
+        chunks = [{motif: ([], []) for motif in scanner.motifs} for _ in range(2)]
+        mask_chunks = []
+        for win_start in range(start, end, window):
+            core_end = min(win_start + window, end)
+            raw = self.fetch(name, win_start, min(core_end + overlap, end))
+            mask_chunks.append(pack_exon_mask(raw[:core_end - win_start]))
+            offset = np.int32(win_start - start)
+            for strand_hits, strand_chunks in zip(scanner.scan(encode_bases(raw)), chunks):
+                for motif, (hit_starts, hit_ends) in strand_hits.items():
+                    keep = hit_starts < core_end - win_start
+                    strand_chunks[motif][0].append(hit_starts[keep] + offset)
+                    strand_chunks[motif][1].append(hit_ends[keep] + offset)
+        hits, minus_hits = ({motif: (_concat(starts), _concat(ends)) for motif, (starts, ends) in strand_chunks.items()}
+                            for strand_chunks in chunks)
+        if not scanner.both_strands:
+            minus_hits = {}
+        label = name if region.strip() == name else region
+        exon_mask = np.concatenate(mask_chunks) if mask_chunks else np.zeros(0, np.uint8)
+        return Sequence.from_parts(label, end - start, exon_mask, hits, minus_hits, seqid=name, offset=start)
+
+
+def check_regions(filepath, regions):
+    """Raise ValueError for the first region that does not parse or names no record, before anything is scanned."""
+    with IndexedFasta(filepath) as fasta:
+        for region in regions:
+            fasta.region_bounds(region)
+
+
+def scan_regions(filepath, regions, scanner, window=1 << 20):
+    """Yield a scanned Sequence for each region of an indexed FASTA, in the order given."""
+    with IndexedFasta(filepath) as fasta:
+        for region in regions:
+            yield fasta.scan_region(region, scanner, window)
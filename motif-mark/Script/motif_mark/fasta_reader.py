@@ -0,0 +1,40 @@
+"""Streaming FASTA reader for plain, gzip and bgzip input."""
+import gzip
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+def open_fasta(filepath):
+    """Open a FASTA file for text reading, decompressing gzip/bgzip transparently."""
+    with open(filepath, 'rb') as f:
+        magic = f.read(2)
+    if magic == GZIP_MAGIC:
+        # bgzip output is a series of gzip members, which GzipFile reads back to back
+        return gzip.open(filepath, 'rt')
+    return open(filepath, 'r')
+
+
+def read_fasta(filepath):
+    """Yield (name, sequence) records one at a time in a single pass over the file.
+
+    Sequence lines are collected as chunks and joined once per record, so long
+    records are built in linear time and only the current record is held in memory.
+    """
+    name = None
+    chunks = []
+    with open_fasta(filepath) as f:
+        for line in f:
+            if line.startswith('>'):
+                if name is not None:
+                    yield name, ''.join(chunks)
+                name = line[1:].strip()
+                chunks = []
+            else:
+                line = line.strip()
+                if not line:
+                    continue
+                if name is None:
+                    raise ValueError(f"{filepath}: sequence data before the first '>' header")
+                chunks.append(line)
+    if name is not None:
+        yield name, ''.join(chunks)
@@ -0,0 +1,111 @@
+"""Two-layer cache of compiled motif matchers: an in-process LRU over an on-disk pickle store."""
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+# bump whenever the pickled matcher classes change shape, so stale entries are ignored
+CACHE_VERSION = 3
+
+
+def default_cache_dir():
+    """$MOTIF_MARK_CACHE_DIR, else $XDG_CACHE_HOME/motif-mark, else ~/.cache/motif-mark."""
+    if os.environ.get('MOTIF_MARK_CACHE_DIR'):
+        return os.environ['MOTIF_MARK_CACHE_DIR']
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'motif-mark')
+
+
+def matcher_key(motifs, kind, both_strands=False):
+    """Hash the normalized motif list (order kept, it drives colors and output order) and matcher settings."""
+    payload = json.dumps({'version': CACHE_VERSION, 'kind': kind, 'both_strands': bool(both_strands),
+                          'motifs': [m.strip().upper() for m in motifs]})
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class MatcherCache:
+    """Return ready-to-scan matchers, compiling them only on a miss in both layers.
+
+    Disk entries are written to a temporary file and atomically renamed into
+    place, so parallel jobs never see a partial entry; unreadable entries are
+    treated as misses and rebuilt. When the store grows past `max_bytes`, the
+    least recently used entries (by mtime, refreshed on every hit) are evicted.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=256 << 20, max_entries=32):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lru = OrderedDict()
+
+    def __len__(self):
+        """Number of matchers held in memory."""
+        return len(self._lru)
+
+    def get(self, motifs, kind, both_strands, build):
+        """Return the matcher for this motif set, calling build() only if no layer has it."""
+        key = matcher_key(motifs, kind, both_strands)
+        if key in self._lru:
+            self._lru.move_to_end(key)
+            return self._lru[key]
+        matcher = self._load(key)
+        if matcher is None:
+            matcher = build()
+            self._store(key, matcher)
+        self._lru[key] = matcher
+        if len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+        return matcher
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + '.pickle')
+
+    def _load(self, key):
+        if not self.cache_dir:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                matcher = pickle.load(f)
+            os.utime(path)
+            return matcher
+        except Exception:
+            # missing, truncated, from an older layout, or evicted mid-read: rebuild it
+            return None
+
+    def _store(self, key, matcher):
+        if not self.cache_dir:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the store fits in max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if not entry.name.endswith('.pickle'):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass  # another job evicted it first
+            total -= size
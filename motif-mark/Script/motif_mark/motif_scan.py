@@ -0,0 +1,230 @@
+"""Single-pass motif scanning over IUPAC motif sets: an expanded-variant automaton and a bitmask matcher."""
+import itertools
+import multiprocessing
+from collections import deque
+
+import numpy as np
+
+from .pool import apply_in_order
+
+# one bit per nucleotide; anything else (N, gaps, ...) encodes to 0 and never matches.
+# U shares T's bit, so RNA motifs match DNA sequence (and vice versa) on both strands
+BASE_BITS = {'A': 1, 'C': 2, 'G': 4, 'T': 8, 'U': 8}
+
+# IUPAC complements, used to compile reverse-complement patterns for --both-strands
+COMPLEMENT = {'A': 'T', 'C': 'G', 'G': 'C', 'T': 'A', 'U': 'A', 'W': 'W', 'S': 'S', 'M': 'K', 'K': 'M',
+              'R': 'Y', 'Y': 'R', 'B': 'V', 'V': 'B', 'D': 'H', 'H': 'D', 'N': 'N'}
+
+_BASE_LUT = np.zeros(256, dtype=np.uint8)
+for _base, _bit in BASE_BITS.items():
+    _BASE_LUT[ord(_base)] = _bit
+    _BASE_LUT[ord(_base.lower())] = _bit
+
+
+def encode_bases(raw):
+    """Encode ASCII sequence bytes (str, bytes or uint8 array) into a uint8 array of base bits."""
+    if isinstance(raw, str):
+        raw = raw.encode('ascii')
+    if not isinstance(raw, np.ndarray):
+        raw = np.frombuffer(raw, dtype=np.uint8)
+    return _BASE_LUT[raw]
+
+
+def reverse_complement(motif):
+    """Reverse-complement a (possibly ambiguous) IUPAC motif."""
+    try:
+        return ''.join(COMPLEMENT[c] for c in reversed(motif.upper()))
+    except KeyError as e:
+        raise ValueError(f"Invalid IUPAC code: {e}")
+
+
+def _as_hit_arrays(starts, length):
+    """Pack a list of start positions into parallel int32 (starts, ends) arrays."""
+    starts = np.asarray(starts, dtype=np.int32)
+    return starts, starts + np.int32(length)
+
+
+class MotifScanner:
+    """Aho-Corasick automaton built from every expanded variant of a motif set.
+
+    The automaton is compiled once per motif set and reused for every sequence,
+    so each record is scanned in a single linear pass no matter how many
+    variants the ambiguous motifs expand to. Transitions are keyed by the
+    encoded base bits, so it runs directly on `encode_bases` output. With
+    both_strands, each variant's reverse complement is compiled into the same
+    automaton, so minus-strand hits come out of the same pass.
+    """
+
+    def __init__(self, motif_dict, both_strands=False):
+        """Compile {motif: [variant, ...]} into a goto/fail automaton."""
+        self.motifs = list(motif_dict)
+        self.both_strands = both_strands
+        self.max_length = 0
+        self.lengths = [0] * len(self.motifs)
+        goto = [{}]
+        outputs = [[]]
+        for idx, motif in enumerate(self.motifs):
+            for variant in motif_dict[motif]:
+                if not variant:
+                    continue
+                # pattern ids: idx for the forward strand, idx + len(motifs) for the reverse complement
+                self._add_pattern(goto, outputs, variant, idx)
+                if both_strands:
+                    self._add_pattern(goto, outputs, reverse_complement(variant), idx + len(self.motifs))
+                self.lengths[idx] = len(variant)
+                self.max_length = max(self.max_length, len(variant))
+        self._delta, self._outputs = self._build_transitions(goto, outputs)
+
+    @staticmethod
+    def _add_pattern(goto, outputs, pattern, pattern_id):
+        """Insert one concrete pattern into the trie."""
+        state = 0
+        for char in encode_bases(pattern.upper()).tobytes():
+            nxt = goto[state].get(char)
+            if nxt is None:
+                nxt = len(goto)
+                goto[state][char] = nxt
+                goto.append({})
+                outputs.append([])
+            state = nxt
+        if pattern_id not in outputs[state]:
+            outputs[state].append(pattern_id)
+
+    @staticmethod
+    def _build_transitions(goto, outputs):
+        """Resolve failure links into a full transition table (one dict lookup per base)."""
+        alphabet = set()
+        for edges in goto:
+            alphabet.update(edges)
+        delta = [dict() for _ in goto]
+        fail = [0] * len(goto)
+        queue = deque()
+        for char in alphabet:
+            nxt = goto[0].get(char, 0)
+            delta[0][char] = nxt
+            if nxt:
+                queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            for char in alphabet:
+                nxt = goto[state].get(char)
+                if nxt is None:
+                    delta[state][char] = delta[fail[state]][char]
+                else:
+                    fail[nxt] = delta[fail[state]][char]
+                    delta[state][char] = nxt
+                    queue.append(nxt)
+        # drop transitions back to the root, they are the .get() default
+        delta = [{c: s for c, s in edges.items() if s} for edges in delta]
+        return delta, [tuple(out) for out in outputs]
+
+    def scan(self, codes):
+        """Return (plus_hits, minus_hits) for an encoded sequence, overlapping hits included.
+
+        Each is {motif: (starts, ends)} of int32 arrays in forward-strand
+        coordinates; minus_hits is empty unless the scanner is both_strands.
+        """
+        ends = [[] for _ in range(2 * len(self.motifs))]
+        delta = self._delta
+        outputs = self._outputs
+        state = 0
+        for pos, code in enumerate(codes.tobytes(), 1):
+            state = delta[state].get(code, 0)
+            for pattern_id in outputs[state]:
+                ends[pattern_id].append(pos)
+        # all variants of one motif share its length, so end order is start order
+        strands = [{motif: _as_hit_arrays(np.asarray(motif_ends) - length, length)
+                    for motif, motif_ends, length in zip(self.motifs, strand_ends, self.lengths)}
+                   for strand_ends in (ends[:len(self.motifs)], ends[len(self.motifs):])]
+        return strands[0], strands[1] if self.both_strands else {}
+
+
+class BitmaskMatcher:
+    """Match ambiguous motifs position by position without expanding them.
+
+    Each motif is compiled into one nucleotide bitmask per position (the union
+    of the bases its IUPAC code allows) and ANDed against the bit-encoded
+    sequence, so matching costs one vectorized AND per motif position
+    regardless of how many concrete variants the motif stands for. With
+    both_strands, the reverse-complement masks are matched against the same
+    encoded array, so the sequence is never copied or reversed.
+    """
+
+    def __init__(self, motifs, iupac_dict, both_strands=False):
+        """Compile each motif into a uint8 array of per-position base masks."""
+        self.motifs = list(dict.fromkeys(m.upper() for m in motifs))
+        self.both_strands = both_strands
+        self.masks = {}
+        self.minus_masks = {}
+        for motif in self.motifs:
+            self.masks[motif] = self._compile(motif, iupac_dict)
+            if both_strands:
+                self.minus_masks[motif] = self._compile(reverse_complement(motif), iupac_dict)
+        self.max_length = max((len(m) for m in self.motifs), default=0)
+
+    @staticmethod
+    def _compile(motif, iupac_dict):
+        try:
+            return np.array([sum(BASE_BITS[base] for base in set(iupac_dict[c])) for c in motif], dtype=np.uint8)
+        except KeyError as e:
+            raise ValueError(f"Invalid IUPAC code: {e}")
+
+    @staticmethod
+    def _match(codes, mask):
+        """Return the int32 (starts, ends) of every window of codes that matches mask."""
+        n = len(codes) - len(mask) + 1
+        if n <= 0 or not len(mask):
+            return _as_hit_arrays([], len(mask))
+        ok = (codes[:n] & mask[0]) != 0
+        for offset in range(1, len(mask)):
+            ok &= (codes[offset:offset + n] & mask[offset]) != 0
+        return _as_hit_arrays(np.flatnonzero(ok), len(mask))
+
+    def scan(self, codes):
+        """Return (plus_hits, minus_hits) for an encoded sequence, overlapping hits included.
+
+        Each is {motif: (starts, ends)} of int32 arrays in forward-strand
+        coordinates; minus_hits is empty unless the matcher is both_strands.
+        """
+        plus = {motif: self._match(codes, mask) for motif, mask in self.masks.items()}
+        minus = {motif: self._match(codes, mask) for motif, mask in self.minus_masks.items()}
+        return plus, minus
+
+
+_worker_scanner = None
+
+
+def _init_worker(scanner):
+    """Pool initializer: receive the compiled scanner once per worker process."""
+    global _worker_scanner
+    _worker_scanner = scanner
+
+
+def _scan_chunk(code_arrays):
+    """Scan one chunk of encoded sequences with the worker's scanner."""
+    return [_worker_scanner.scan(codes) for codes in code_arrays]
+
+
+def scan_records(sequences, scanner, workers=1, chunksize=64):
+    """Fill in `hits` and `minus_hits` on each encoded Sequence and yield it, in input order.
+
+    With workers > 1 the records are scanned in a process pool. The scanner is
+    shipped to each worker once through the pool initializer, only the encoded
+    bases are sent in chunks of `chunksize` to keep IPC overhead low on short
+    sequences, and at most two chunks per worker are in flight so streamed
+    input stays bounded.
+    """
+    if workers <= 1:
+        for seq in sequences:
+            seq.hits, seq.minus_hits = scanner.scan(seq.codes)
+            yield seq
+        return
+    sequences = iter(sequences)
+    chunks = iter(lambda: list(itertools.islice(sequences, chunksize)), [])
+    tasks = ((chunk, ([seq.codes for seq in chunk],)) for chunk in chunks)
+    with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(scanner,)) as pool:
+        for chunk, results in apply_in_order(pool, _scan_chunk, tasks, 2 * workers):
+            for seq, (hits, minus_hits) in zip(chunk, results):
+                seq.hits, seq.minus_hits = hits, minus_hits
+                yield seq
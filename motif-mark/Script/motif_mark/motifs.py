@@ -0,0 +1,100 @@
+"""IUPAC motif sets and the matchers compiled from them."""
+import itertools
+
+from .motif_scan import BitmaskMatcher, MotifScanner
+
+IUPAC_dict = {
+    'A': ['A'], 'C': ['C'], 'G': ['G'], 'T': ['T'], 'U': ['U'], 'W': ['A', 'T'], 'S': ['G', 'C'],
+    'M': ['A', 'C'], 'K': ['G', 'T'], 'R': ['A', 'G'], 'Y': ['C', 'T'], 'B': ['C', 'G', 'T'], 'D': ['A', 'G', 'T'], 'H': ['A', 'C', 'T'], 'V': ['A', 'C', 'G'], 'N': ['A', 'C', 'T', 'G']
+}
+
+MATCHERS = ("auto", "automaton", "bitmask")
+
+# above this many motif positions (both strands counted), one vectorized pass
+# per position costs more than the automaton's single Python pass per base
+AUTO_BITMASK_POSITIONS = 512
+
+# ...unless the automaton would hold more expanded variants than this: compiling
+# ~10k variants already takes as long as scanning a megabase, and N-heavy
+# motifs expand four-fold per N
+AUTO_MAX_VARIANTS = 10_000
+
+
+def read_motifs(filepath):
+    """Read motifs from a file, returning a list of uppercase motif strings."""
+    with open(filepath, 'r') as f:
+        return [line.strip().upper() for line in f if line.strip()]
+
+
+def expand_motif(motif):
+    """Expand a single ambiguous motif into all possible IUPAC-resolved variants."""
+    try:
+        chars = [IUPAC_dict[c] for c in motif]
+    except KeyError as e:
+        raise ValueError(f"Invalid IUPAC code: {e}")
+    return [''.join(p) for p in itertools.product(*chars)]
+
+
+def variant_count(motif):
+    """Number of concrete variants expand_motif would produce, without expanding."""
+    count = 1
+    for c in motif:
+        count *= len(IUPAC_dict.get(c, ()))
+    return count
+
+
+def choose_matcher(motifs, both_strands=False):
+    """Resolve the "auto" matcher: bitmask for typical motif sets, the automaton for very large ones.
+
+    The automaton is only chosen while its expanded variant count stays small
+    enough to compile quickly; otherwise the bitmask matcher is used.
+    """
+    strands = 2 if both_strands else 1
+    positions = sum(len(m) for m in motifs) * strands
+    if positions <= AUTO_BITMASK_POSITIONS:
+        return "bitmask"
+    variants = sum(variant_count(m.upper()) for m in motifs) * strands
+    return "automaton" if variants <= AUTO_MAX_VARIANTS else "bitmask"
+
+
+def build_matcher(motifs, kind="auto", both_strands=False):
+    """Compile the motif list into a scanner exposing scan(codes) -> (plus_hits, minus_hits)."""
+    if kind not in MATCHERS:
+        raise ValueError(f"Unknown matcher: {kind}")
+    if kind == "auto":
+        kind = choose_matcher(motifs, both_strands)
+    if kind == "bitmask":
+        return BitmaskMatcher(motifs, IUPAC_dict, both_strands)
+    return MotifScanner({m.upper(): expand_motif(m.upper()) for m in motifs}, both_strands)
+
+
+class Motifs:
+    """An ordered set of IUPAC motifs; the order drives plot colors and output order."""
+
+    def __init__(self, motifs):
+        self.motifs = [m.strip().upper() for m in motifs if m.strip()]
+
+    @classmethod
+    def from_file(cls, filepath):
+        return cls(read_motifs(filepath))
+
+    def __iter__(self):
+        return iter(self.motifs)
+
+    def __len__(self):
+        return len(self.motifs)
+
+    def __repr__(self):
+        return f"Motifs({self.motifs!r})"
+
+    def variant_counts(self):
+        """Return {motif: number of concrete variants}."""
+        return {m: variant_count(m) for m in self.motifs}
+
+    def matcher(self, kind="auto", both_strands=False, cache=None):
+        """Return a compiled matcher, loading it from a MatcherCache when one is given."""
+        if kind == "auto":
+            kind = choose_matcher(self.motifs, both_strands)
+        if cache is None:
+            return build_matcher(self.motifs, kind, both_strands)
+        return cache.get(self.motifs, kind, both_strands, lambda: build_matcher(self.motifs, kind, both_strands))
@@ -0,0 +1,196 @@
+"""Cairo rendering of scanned records; cairo is only imported by code that draws."""
+import itertools
+import multiprocessing
+
+import cairo
+
+from .pool import apply_in_order
+from .render import base_scale, exon_rectangles, track_rectangles
+
+PALETTE = [
+    [1, 0.6, 0.3], [1, 0.8, 0.2], [0, 0.2, 0.8], [0.2, 0.9, 0.8], [0.5, 0.3, 1],
+    [0.7, 0, 0.1], [0.5, 0.7, 0.6], [0.1, 0.7, 0.6], [0.5, 0.7, 0.5], [0.5, 0.3, 0.4]
+]
+
+class Plot:
+    def __init__(self, width, outname, fmt="svg"):
+        """Initialize an unbounded Cairo recording surface; the output is sized once all records are drawn."""
+        self.width = width
+        self.height = 100
+        self.track_pixels = width - 150  # sequence lines start at x=100; keep a margin on the right
+        self.filename = outname
+        self.fmt = fmt
+        self.surface = cairo.RecordingSurface(cairo.CONTENT_COLOR_ALPHA, None)
+        self.ctx = cairo.Context(self.surface)
+        self.colors = {}
+        self.shapes = 0  # text, lines and rectangles drawn, for --stats-json
+        self.records = 0  # records drawn so far; draw() can be called again to append more
+
+    def _draw_background(self, ctx):
+        """Fill the entire surface with a white background."""
+        ctx.rectangle(0,0,self.width, self.height)
+        ctx.set_source_rgb(1, 1, 1)
+        ctx.fill()
+
+    def assign_colors(self, motifs, palette):
+        """Assign RGB colors to each motif using a predefined color palette."""
+        for motif, color in zip(motifs, palette):
+            self.colors[motif] = color
+
+    def draw(self, sequences):
+        """Draw gene sequences, exons, and motif locations for scanned Sequence records as they stream in."""
+        for seq_obj in sequences:
+            self.records += 1
+            y_offset = 200 * self.records
+            self.height = y_offset + 100
+            self.ctx.set_source_rgb(0, 0, 0)
+            self.ctx.move_to(50, y_offset - 100)
+            self.ctx.set_font_size(20)
+            self.ctx.show_text(seq_obj.name)
+
+            scale = base_scale(seq_obj.length, self.track_pixels)
+            self.ctx.set_line_width(3)
+            self.ctx.move_to(100, y_offset)
+            self.ctx.line_to(100 + seq_obj.length * scale, y_offset)
+            self.ctx.stroke()
+
+            xs, widths = exon_rectangles(*seq_obj.exons(), seq_obj.length, self.track_pixels)
+            for x, w in zip(xs.tolist(), widths.tolist()):
+                self.ctx.rectangle(100 + x, y_offset - 50, w, 100)
+            self.ctx.set_source_rgba(0, 0, 0, 0.1)
+            self.ctx.fill()
+            self.shapes += 2 + len(xs)
+
+            if seq_obj.minus_hits:
+                # plus-strand hits above the line, minus-strand hits on their own track below it
+                self._draw_hits(seq_obj.hits, seq_obj.length, y_offset - 50, 50)
+                self._draw_hits(seq_obj.minus_hits, seq_obj.length, y_offset, 50)
+                self.ctx.set_source_rgb(0, 0, 0)
+                self.ctx.set_font_size(14)
+                self.ctx.move_to(80, y_offset - 20)
+                self.ctx.show_text("+")
+                self.ctx.move_to(80, y_offset + 30)
+                self.ctx.show_text("-")
+                self.shapes += 2
+            else:
+                self._draw_hits(seq_obj.hits, seq_obj.length, y_offset - 50, 100)
+
+    def _draw_hits(self, hits, length, y, height):
+        """Draw one track of {motif: (starts, ends)} hits between y and y + height, one path and one fill per motif.
+
+        Overlapping hits are merged into blocks; records longer than the track
+        width are drawn as per-pixel hit-density bars instead.
+        """
+        for motif, (starts, ends) in hits.items():
+            xs, widths, fills = track_rectangles(starts, ends, length, self.track_pixels)
+            if not len(xs):
+                continue
+            for x, w, f in zip(xs.tolist(), widths.tolist(), fills.tolist()):
+                self.ctx.rectangle(100 + x, y + height * (1 - f) / 2, w, height * f)
+            self.shapes += len(xs)
+            self.ctx.set_source_rgba(*self.colors[motif], 0.5)
+            self.ctx.fill()
+
+    def draw_legend(self, motifs):
+        """Draw a color legend for motifs and exon regions on the plot."""
+        for i, motif in enumerate(motifs):
+            y = 100 + 40 * i
+            self.ctx.rectangle(850, y, 20, 20)
+            self.ctx.set_source_rgba(*self.colors[motif], 0.5)
+            self.ctx.fill()
+            self.ctx.move_to(880, y + 15)
+            self.ctx.set_font_size(20)
+            self.ctx.set_source_rgb(0, 0, 0)
+            self.ctx.show_text(motif)
+
+        self.ctx.rectangle(850, 60, 20, 20)
+        self.ctx.set_source_rgba(0, 0, 0, 0.1)
+        self.ctx.fill()
+        self.ctx.move_to(880, 75)
+        self.ctx.show_text("EXON")
+        self.shapes += 2 * len(motifs) + 2
+
+    def paint_onto(self, ctx):
+        """Replay the recorded drawing onto another context over a white background."""
+        self._draw_background(ctx)
+        ctx.set_source_surface(self.surface, 0, 0)
+        ctx.paint()
+
+    def save(self):
+        """Write the recorded drawing to self.filename as SVG, PNG or PDF, sized to the records drawn."""
+        if self.fmt == "png":
+            out = cairo.ImageSurface(cairo.FORMAT_ARGB32, self.width, self.height)
+        elif self.fmt == "pdf":
+            out = cairo.PDFSurface(self.filename, self.width, self.height)
+        else:
+            out = cairo.SVGSurface(self.filename, self.width, self.height)
+        self.paint_onto(cairo.Context(out))
+        if self.fmt == "png":
+            out.write_to_png(self.filename)
+        out.finish()
+        self.surface.finish()
+
+    def show(self):
+        """Display the saved file inline in a Jupyter notebook."""
+        from IPython import display
+        if self.fmt == "png":
+            return display.Image(filename=self.filename)
+        if self.fmt == "svg":
+            return display.SVG(filename=self.filename)
+        raise ValueError(f"Cannot display {self.fmt} inline")
+
+def render_page(page):
+    """Render one page of scanned records, legend included, to its own file (runs in a pool worker).
+
+    Returns (filename, shapes drawn).
+    """
+    filename, fmt, motifs, palette, sequences = page
+    plot = Plot(1200, filename, fmt)
+    plot.assign_colors(motifs, palette)
+    plot.draw(sequences)
+    plot.draw_legend(motifs)
+    plot.save()
+    return filename, plot.shapes
+
+def paginate(sequences, page_size):
+    """Group scanned records into lists of page_size, dropping the encoded bases the plot does not need."""
+    sequences = iter(sequences)
+    while True:
+        page = list(itertools.islice(sequences, page_size))
+        if not page:
+            return
+        for seq in page:
+            seq.codes = None
+        yield page
+
+def render_pages(sequences, page_size, fmt, prefix, motifs, palette, workers=1):
+    """Split records into fixed-size pages and return the (filename, shapes drawn) of each file written.
+
+    SVG and PNG pages are written as numbered files, each rendered by its own
+    worker process with at most two pages per worker in flight. PDF pages go
+    into one multi-page document, which has to be drawn from a single process.
+    """
+    if fmt == "pdf":
+        filename = f"{prefix}.pdf"
+        pdf = cairo.PDFSurface(filename, 1200, 100)
+        ctx = cairo.Context(pdf)
+        shapes = 0
+        for page in paginate(sequences, page_size):
+            plot = Plot(1200, filename, fmt)
+            plot.assign_colors(motifs, palette)
+            plot.draw(page)
+            plot.draw_legend(motifs)
+            pdf.set_size(plot.width, plot.height)
+            plot.paint_onto(ctx)
+            ctx.show_page()
+            plot.surface.finish()
+            shapes += plot.shapes
+        pdf.finish()
+        return [(filename, shapes)]
+
+    pages = ((f"{prefix}_page{n:03d}.{fmt}", fmt, motifs, palette, page)
+             for n, page in enumerate(paginate(sequences, page_size), 1))
+    if workers <= 1:
+        return [render_page(page) for page in pages]
+    with multiprocessing.Pool(workers) as pool:
+        return [result for _, result in apply_in_order(pool, render_page, ((None, (page,)) for page in pages), 2 * workers)]
@@ -0,0 +1,19 @@
+"""Ordered, bounded fan-out of tasks to a multiprocessing pool."""
+from collections import deque
+
+
+def apply_in_order(pool, func, tasks, in_flight):
+    """Run func(*args) in the pool for each (key, args) in tasks and yield (key, result) in input order.
+
+    At most `in_flight` tasks are pending at once, so a streamed `tasks`
+    iterable is consumed only as fast as results are taken.
+    """
+    pending = deque()
+    for key, args in tasks:
+        pending.append((key, pool.apply_async(func, args)))
+        if len(pending) >= in_flight:
+            key, result = pending.popleft()
+            yield key, result.get()
+    while pending:
+        key, result = pending.popleft()
+        yield key, result.get()
@@ -0,0 +1,58 @@
+"""Level-of-detail helpers that keep Cairo output bounded for dense and long records."""
+import numpy as np
+
+PAGE_FORMATS = ("svg", "png", "pdf")
+
+
+def merge_intervals(starts, ends):
+    """Merge overlapping or touching [start, end) intervals sorted by start into disjoint ones."""
+    if not len(starts):
+        return starts, ends
+    reach = np.maximum.accumulate(ends)
+    # a new block starts wherever a hit begins past everything before it
+    new_block = np.empty(len(starts), dtype=bool)
+    new_block[0] = True
+    new_block[1:] = starts[1:] > reach[:-1]
+    first = np.flatnonzero(new_block)
+    last = np.append(first[1:], len(starts)) - 1
+    return starts[first], reach[last]
+
+
+def track_rectangles(starts, ends, length, pixels):
+    """Return (x, width, fill) arrays of the rectangles that draw one motif's hits on one track.
+
+    When the record fits in `pixels` (one pixel per base), hits are merged into
+    disjoint blocks drawn at full height. Longer records switch to binned hit
+    density: one bar per pixel whose height fraction is its hit count relative
+    to the busiest pixel. Either way the rectangle count is bounded by `pixels`.
+    """
+    if not len(starts):
+        empty = np.zeros(0)
+        return empty, empty, empty
+    if length <= pixels:
+        block_starts, block_ends = merge_intervals(starts, ends)
+        return block_starts.astype(float), (block_ends - block_starts).astype(float), np.ones(len(block_starts))
+    bins = np.minimum(starts.astype(np.int64) * pixels // length, pixels - 1)
+    counts = np.bincount(bins, minlength=pixels)
+    occupied = np.flatnonzero(counts)
+    return occupied.astype(float), np.ones(len(occupied)), counts[occupied] / counts.max()
+
+
+def exon_rectangles(starts, ends, length, pixels):
+    """Return (x, width) arrays of the rectangles that draw a record's exons on a `pixels`-wide track.
+
+    Records that fit are drawn one base per pixel, one rectangle per exon.
+    Longer records snap each exon out to the pixel columns it touches and merge
+    exons sharing or touching a column, so at most `pixels` rectangles are drawn.
+    """
+    if length <= pixels or not len(starts):
+        return starts.astype(float), (ends - starts).astype(float)
+    first = starts.astype(np.int64) * pixels // length
+    last = -(-ends.astype(np.int64) * pixels // length)
+    block_starts, block_ends = merge_intervals(first, last)
+    return block_starts.astype(float), (block_ends - block_starts).astype(float)
+
+
+def base_scale(length, pixels):
+    """Pixels per base: 1 while the record fits, shrinking so longer records span exactly `pixels`."""
+    return min(1.0, pixels / length) if length else 1.0
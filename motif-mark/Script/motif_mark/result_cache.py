@@ -0,0 +1,97 @@
+"""SQLite cache of per-record, per-motif hits so reruns only scan new record x motif pairs."""
+import hashlib
+import sqlite3
+
+import numpy as np
+
+# bump whenever hit semantics change; older databases are cleared on open
+SCHEMA_VERSION = 2
+
+
+def sequence_key(codes):
+    """Hash a record's encoded bases (case does not affect hits, so exon/intron edits keep the key)."""
+    return hashlib.blake2b(codes.tobytes(), digest_size=16).hexdigest()
+
+
+def motif_key(motif):
+    """Hash a single normalized motif."""
+    return hashlib.blake2b(motif.strip().upper().encode(), digest_size=16).hexdigest()
+
+
+class CachedScanner:
+    """Drop-in scanner that answers from an SQLite result cache and scans only what is missing.
+
+    Hits are stored per (sequence hash, motif hash), so adding a motif to the
+    motif file or appending records to the FASTA only scans the new pairs;
+    everything else is rebuilt from cached rows. Missing motifs are scanned
+    with a matcher compiled for just that subset by `build(motifs)`. The
+    connection is opened lazily in each process, so the scanner can be
+    shipped to --workers pool processes; WAL mode lets them write concurrently.
+    """
+
+    def __init__(self, scanner, build, db_path):
+        self.motifs = scanner.motifs
+        self.max_length = scanner.max_length
+        self.both_strands = scanner.both_strands
+        self.db_path = db_path
+        self._build = build
+        self._subscanners = {tuple(self.motifs): scanner}
+        self._keys = {motif: motif_key(motif) for motif in self.motifs}
+        self._lengths = {motif: len(motif) for motif in self.motifs}
+        self._db = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_db'] = None
+        return state
+
+    def _connect(self):
+        if self._db is None:
+            db = sqlite3.connect(self.db_path, timeout=60)
+            db.execute('PRAGMA journal_mode=WAL')
+            if db.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                db.execute('DROP TABLE IF EXISTS hits')
+                db.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+            db.execute('CREATE TABLE IF NOT EXISTS hits ('
+                       'seq_key TEXT NOT NULL, motif_key TEXT NOT NULL, plus BLOB NOT NULL, minus BLOB, '
+                       'PRIMARY KEY (seq_key, motif_key))')
+            db.commit()
+            self._db = db
+        return self._db
+
+    def _subscanner(self, motifs):
+        key = tuple(motifs)
+        if key not in self._subscanners:
+            self._subscanners[key] = self._build(list(motifs))
+        return self._subscanners[key]
+
+    def _as_hits(self, motif, blob):
+        starts = np.frombuffer(blob, dtype=np.int32)
+        return starts, starts + np.int32(self._lengths[motif])
+
+    def scan(self, codes):
+        """Return (plus_hits, minus_hits) like the wrapped scanner, scanning only uncached motifs."""
+        db = self._connect()
+        seq_key = sequence_key(codes)
+        by_key = {key: motif for motif, key in self._keys.items()}
+        plus, minus = {}, {}
+        for key, plus_blob, minus_blob in db.execute(
+                'SELECT motif_key, plus, minus FROM hits WHERE seq_key = ?', (seq_key,)):
+            motif = by_key.get(key)
+            if motif is None or (self.both_strands and minus_blob is None):
+                continue
+            plus[motif] = self._as_hits(motif, plus_blob)
+            if self.both_strands:
+                minus[motif] = self._as_hits(motif, minus_blob)
+        missing = [motif for motif in self.motifs if motif not in plus]
+        if missing:
+            new_plus, new_minus = self._subscanner(missing).scan(codes)
+            plus.update(new_plus)
+            minus.update(new_minus)
+            with db:
+                db.executemany('INSERT OR REPLACE INTO hits VALUES (?, ?, ?, ?)',
+                               [(seq_key, self._keys[motif], new_plus[motif][0].tobytes(),
+                                 new_minus[motif][0].tobytes() if motif in new_minus else None)
+                                for motif in missing])
+        return ({motif: plus[motif] for motif in self.motifs},
+                {motif: minus[motif] for motif in self.motifs} if self.both_strands else {})
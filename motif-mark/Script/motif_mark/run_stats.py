@@ -0,0 +1,135 @@
+"""Per-stage wall time, process peak RSS and run counters, reported as JSON for job schedulers."""
+import cProfile
+import json
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+
+def peak_rss_bytes(who='self'):
+    """Peak resident set size of this process (or of its reaped children) so far, in bytes."""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == 'self' else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    return usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+
+class RunStats:
+    """Collect exclusive wall time per stage plus counters for one pipeline run.
+
+    Stages nest: while a stage is running, the stage it interrupted is paused,
+    so streamed stages (parse feeding scan feeding render) are each charged
+    only their own time. Peak RSS is reported for the whole process only: the
+    kernel's high-water mark never goes down, so it cannot be split by stage.
+    Optionally, cProfile runs only while `profile_stage` is the innermost
+    active stage.
+    """
+
+    def __init__(self, profile_stage=None):
+        self.wall = Counter()
+        self.records = 0
+        self.bases = 0
+        self.bytes_read = 0
+        self.shapes = 0
+        self.variants = {}
+        self.hits = Counter()
+        self.minus_hits = Counter()
+        self.profile_stage = profile_stage
+        self.profiler = cProfile.Profile() if profile_stage else None
+        self._stack = []
+        self._started = time.perf_counter()
+        self._run_started = self._started
+
+    def _switch(self):
+        now = time.perf_counter()
+        if self._stack:
+            self.wall[self._stack[-1]] += now - self._started
+        self._started = now
+
+    def _update_profiler(self):
+        if self.profiler is None:
+            return
+        if self._stack and self._stack[-1] == self.profile_stage:
+            self.profiler.enable()
+        else:
+            self.profiler.disable()
+
+    def _enter(self, name):
+        self._switch()
+        self._stack.append(name)
+        self._update_profiler()
+
+    def _exit(self):
+        self._switch()
+        self._stack.pop()
+        self._update_profiler()
+
+    @contextmanager
+    def stage(self, name):
+        """Charge the time spent in the with-block to `name`."""
+        self._enter(name)
+        try:
+            yield
+        finally:
+            self._exit()
+
+    def timed_iter(self, name, iterable):
+        """Yield from iterable, charging the time spent producing each item to `name`."""
+        iterator = iter(iterable)
+        while True:
+            self._enter(name)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit()
+            yield item
+
+    def count_records(self, sequences):
+        """Pass scanned records through, counting records, bases and hits per motif."""
+        for seq in sequences:
+            self.records += 1
+            self.bases += seq.length
+            for motif, (starts, _) in seq.hits.items():
+                self.hits[motif] += len(starts)
+            for motif, (starts, _) in seq.minus_hits.items():
+                self.minus_hits[motif] += len(starts)
+            yield seq
+
+    def to_dict(self):
+        stages = {name: {'seconds': round(seconds, 6)} for name, seconds in self.wall.items()}
+        return {
+            'total_seconds': round(time.perf_counter() - self._run_started, 6),
+            'peak_rss_bytes': peak_rss_bytes(),
+            'children_peak_rss_bytes': peak_rss_bytes('children'),
+            'stages': stages,
+            'records': self.records,
+            'bases': self.bases,
+            'bytes_read': self.bytes_read,
+            'shapes_drawn': self.shapes,
+            'variants_per_motif': self.variants,
+            'hits_per_motif': dict(self.hits),
+            'minus_hits_per_motif': dict(self.minus_hits),
+        }
+
+    def write_json(self, path):
+        """Write the summary to path, or to stderr when path is '-'."""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path == '-':
+            print(text, file=sys.stderr)
+        else:
+            with open(path, 'w') as f:
+                f.write(text + '\n')
+
+    def write_profile(self, path):
+        """Dump the cProfile stats of the profiled stage (load with pstats or snakeviz)."""
+        self.profiler.disable()
+        self.profiler.dump_stats(path)
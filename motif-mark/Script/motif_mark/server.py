@@ -0,0 +1,159 @@
+"""Long-running localhost HTTP server that keeps compiled motif sets warm and answers scan requests.
+
+Start it once, then POST one JSON request per FASTA instead of starting a new
+interpreter and recompiling the motif set for every file:
+
+    python -m motif_mark.server --port 8765 &
+    curl -s localhost:8765/scan -d '{"fasta": "genes.fa", "motif_file": "motifs.txt", "format": "bed"}'
+
+Request fields: `fasta` (path readable by the server), `motifs` (list) or
+`motif_file`, and optionally `matcher`, `both_strands`, `regions`, `window`
+and `format` (bed, gff3, tsv, or json, the default). GET /status reports how
+many compiled motif sets are held.
+"""
+import argparse
+import io
+import json
+import logging
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .encoded_sequence import Sequence
+from .export import FORMATS, HitWriter
+from .fasta_index import scan_regions
+from .fasta_reader import read_fasta
+from .motif_cache import MatcherCache, default_cache_dir
+from .motif_scan import scan_records
+from .motifs import MATCHERS, Motifs
+
+DEFAULT_PORT = 8765
+
+
+def _hit_pairs(hits, offset):
+    return {motif: list(zip((starts + offset).tolist(), (ends + offset).tolist()))
+            for motif, (starts, ends) in hits.items()}
+
+
+def record_json(seq):
+    """JSON-ready summary of one scanned record, with hits in record coordinates."""
+    exon_starts, exon_ends = seq.exons()
+    return {'seqid': seq.seqid, 'name': seq.name, 'offset': seq.offset, 'length': seq.length,
+            'exons': list(zip((exon_starts + seq.offset).tolist(), (exon_ends + seq.offset).tolist())),
+            'hits': _hit_pairs(seq.hits, seq.offset), 'minus_hits': _hit_pairs(seq.minus_hits, seq.offset)}
+
+
+class ScanServer(ThreadingHTTPServer):
+    """HTTP server holding a MatcherCache, so each motif set is compiled (or unpickled) once per server."""
+
+    daemon_threads = True
+
+    def __init__(self, address, cache_dir=None, max_entries=32, workers=1):
+        super().__init__(address, ScanHandler)
+        self.cache = MatcherCache(cache_dir, max_entries=max_entries)
+        self.lock = threading.Lock()  # MatcherCache's LRU is not thread-safe
+        self.workers = workers
+
+    def scan(self, request):
+        """Answer one scan request; returns (content type, body text)."""
+        if 'motifs' in request:
+            motifs = Motifs(request['motifs'])
+        elif 'motif_file' in request:
+            motifs = Motifs.from_file(request['motif_file'])
+        else:
+            raise ValueError("request needs 'motifs' or 'motif_file'")
+        if 'fasta' not in request:
+            raise ValueError("request needs 'fasta'")
+        kind = request.get('matcher', 'auto')
+        if kind not in MATCHERS:
+            raise ValueError(f"Unknown matcher: {kind}")
+        fmt = request.get('format', 'json')
+        if fmt != 'json' and fmt not in FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        with self.lock:
+            scanner = motifs.matcher(kind, bool(request.get('both_strands')), self.cache)
+
+        if request.get('regions'):
+            scanned = scan_regions(request['fasta'], request['regions'], scanner, int(request.get('window', 1 << 20)))
+        else:
+            sequences = (Sequence(name, seq) for name, seq in read_fasta(request['fasta']))
+            scanned = scan_records(sequences, scanner, self.workers)
+        if fmt == 'json':
+            return 'application/json', json.dumps({'records': [record_json(seq) for seq in scanned]})
+        out = io.StringIO()
+        writer = HitWriter(out, fmt)
+        for seq in scanned:
+            writer.write(seq)
+        writer.close()
+        return 'text/plain', out.getvalue()
+
+
+class ScanHandler(BaseHTTPRequestHandler):
+
+    def _reply(self, status, content_type, body):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status, message):
+        self._reply(status, 'application/json', json.dumps({'error': message}))
+
+    def do_GET(self):
+        if self.path != '/status':
+            return self._error(404, f"no such endpoint: {self.path}")
+        with self.server.lock:
+            held = len(self.server.cache)
+        self._reply(200, 'application/json', json.dumps({'status': 'ok', 'matchers': held}))
+
+    def do_POST(self):
+        if self.path != '/scan':
+            return self._error(404, f"no such endpoint: {self.path}")
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            content_type, body = self.server.scan(request)
+        except (ValueError, KeyError, TypeError, OSError) as e:
+            return self._error(400, str(e))
+        self._reply(200, content_type, body)
+
+    def log_message(self, format, *args):
+        logging.info("%s %s", self.address_string(), format % args)
+
+
+def request_scan(request, host='127.0.0.1', port=DEFAULT_PORT, timeout=None):
+    """Send one scan request to a running server; returns parsed JSON, or text for bed/gff3/tsv."""
+    req = urllib.request.Request(f'http://{host}:{port}/scan', data=json.dumps(request).encode(),
+                                 headers={'Content-Type': 'application/json'})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        body = response.read().decode()
+    return json.loads(body) if request.get('format', 'json') == 'json' else body
+
+
+def get_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve motif scans over localhost HTTP with compiled motif sets kept warm")
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (keep it local: requests name server-side paths)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=1, help="number of processes used to scan the records of one request")
+    parser.add_argument("--cache-dir", default=default_cache_dir(), help="on-disk compiled-motif cache shared with the CLI")
+    parser.add_argument("--no-cache", action="store_true", help="keep compiled motif sets in memory only")
+    parser.add_argument("--max-entries", type=int, default=32, help="compiled motif sets kept in memory")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO)
+    args = get_args(argv)
+    server = ScanServer((args.host, args.port), None if args.no_cache else args.cache_dir, args.max_entries, args.workers)
+    logging.info("serving on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
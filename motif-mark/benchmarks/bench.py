@@ -0,0 +1,171 @@
+#!/usr/bin/env python
+"""Benchmark the parse, scan and render stages on synthetic FASTA and motif inputs.
+
+Example:
+    ./bench.py --records 2000 --length 5000 --ambiguity 0.5 --out results.json
+    ./bench.py ... --save-baseline          # store results as the baseline
+    ./bench.py ... --baseline baseline.json # exit 1 if a stage regressed
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Script')
+sys.path.insert(0, SCRIPT_DIR)
+
+from motif_mark import Sequence, build_matcher, read_fasta  # noqa: E402
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def get_args():
+    parser = argparse.ArgumentParser(description="Benchmark motif-mark stages on synthetic inputs")
+    parser.add_argument("--records", type=int, default=500, help="number of FASTA records")
+    parser.add_argument("--length", type=int, default=2000, help="bases per record")
+    parser.add_argument("--exons", type=int, default=3, help="exons per record")
+    parser.add_argument("--case", choices=["exons", "upper", "lower"], default="exons",
+                        help="exons: uppercase exons in lowercase introns; upper/lower: one case throughout")
+    parser.add_argument("--line-width", type=int, default=60, help="FASTA line width")
+    parser.add_argument("--motifs", type=int, default=4, help="number of motifs")
+    parser.add_argument("--motif-length", type=int, default=8)
+    parser.add_argument("--ambiguity", type=float, default=0.25, help="fraction of motif positions that are N or Y")
+    parser.add_argument("--matcher", choices=["auto", "automaton", "bitmask"], default="auto")
+    parser.add_argument("--both-strands", action="store_true")
+    parser.add_argument("--repeat", type=int, default=3, help="timed repetitions per stage (best is kept)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-render", action="store_true", help="do not time the Plot stage")
+    parser.add_argument("--out", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help=f"compare against this results JSON (e.g. {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown / memory growth before flagging")
+    return parser.parse_args()
+
+
+def synthetic_fasta(path, records, length, exons, case, line_width, rng):
+    """Write a FASTA of random records with `exons` uppercase blocks separated by lowercase introns."""
+    with open(path, 'w') as f:
+        for i in range(records):
+            seq = ''.join(rng.choice('acgt') for _ in range(length))
+            if case == 'upper':
+                seq = seq.upper()
+            elif case == 'exons' and exons:
+                bounds = sorted(rng.sample(range(length), min(2 * exons, length)))
+                parts = []
+                last = 0
+                for start, end in zip(bounds[::2], bounds[1::2]):
+                    parts.append(seq[last:start])
+                    parts.append(seq[start:end].upper())
+                    last = end
+                parts.append(seq[last:])
+                seq = ''.join(parts)
+            f.write(f">synthetic_{i} chr1:{i * length + 1}-{(i + 1) * length}\n")
+            for j in range(0, length, line_width):
+                f.write(seq[j:j + line_width] + '\n')
+
+
+def synthetic_motifs(count, length, ambiguity, rng):
+    """Return `count` motifs of `length` where roughly `ambiguity` of positions are N or Y."""
+    return [''.join(rng.choice('NY') if rng.random() < ambiguity else rng.choice('ACGT') for _ in range(length))
+            for _ in range(count)]
+
+
+def measure(stage, repeat):
+    """Return best wall time over `repeat` runs and the traced peak allocation of one more run."""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        stage()
+        best = min(best, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    stage()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {'seconds': best, 'peak_bytes': peak}
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of human-readable regressions against a baseline results dict."""
+    regressions = []
+    ignored = ('repeat', 'tolerance')
+    if {k: v for k, v in baseline.get('config', {}).items() if k not in ignored} != \
+            {k: v for k, v in results['config'].items() if k not in ignored}:
+        print("warning: baseline was recorded with a different configuration", file=sys.stderr)
+    for stage, current in results['stages'].items():
+        previous = baseline.get('stages', {}).get(stage)
+        if not previous:
+            continue
+        for metric in ('seconds', 'peak_bytes'):
+            if previous[metric] and current[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{stage} {metric}: {previous[metric]:.6g} -> {current[metric]:.6g}")
+    return regressions
+
+
+def main():
+    args = get_args()
+    rng = random.Random(args.seed)
+    motifs = synthetic_motifs(args.motifs, args.motif_length, args.ambiguity, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fasta = os.path.join(tmp, 'synthetic.fasta')
+        synthetic_fasta(fasta, args.records, args.length, args.exons, args.case, args.line_width, rng)
+        stages = {}
+
+        stages['parse'] = measure(lambda: sum(1 for _ in read_fasta(fasta)), args.repeat)
+        sequences = [Sequence(name, seq) for name, seq in read_fasta(fasta)]
+
+        stages['compile'] = measure(lambda: build_matcher(motifs, args.matcher, args.both_strands), args.repeat)
+        scanner = build_matcher(motifs, args.matcher, args.both_strands)
+
+        def scan():
+            for seq in sequences:
+                seq.hits, seq.minus_hits = scanner.scan(seq.codes)
+        stages['scan'] = measure(scan, args.repeat)
+
+        if not args.skip_render:
+            from motif_mark import Plot  # imports cairo
+
+            palette = [[0.2 + 0.6 * i / max(len(motifs), 1), 0.5, 0.8] for i in range(len(motifs))]
+
+            def render():
+                plot = Plot(1200, os.path.join(tmp, 'bench.svg'))
+                plot.assign_colors(motifs, palette)
+                plot.draw(sequences)
+                plot.draw_legend(motifs)
+                plot.save()
+            stages['render'] = measure(render, args.repeat)
+
+    results = {
+        'config': {k: v for k, v in vars(args).items() if k not in ('out', 'baseline', 'save_baseline')},
+        'motifs': motifs,
+        'python': platform.python_version(),
+        'stages': stages,
+    }
+    text = json.dumps(results, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            f.write(text + '\n')
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
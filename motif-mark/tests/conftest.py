@@ -0,0 +1,5 @@
+import os
+import sys
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Script')
+sys.path.insert(0, SCRIPT_DIR)
@@ -0,0 +1,101 @@
+"""Batch manifests: jobs sharing a FASTA get the same hits as running each job alone."""
+import io
+import json
+
+import pytest
+
+from motif_mark import HitWriter, MatcherCache, Sequence, build_matcher, read_fasta
+from motif_mark.batch import read_manifest, restrict, run_batch
+
+RECORDS = [('chr1 first', 'ttYGCAttGCTTacatgcGCATGcatag' * 3), ('chr2', 'CATAGcatagYGCYtgct')]
+
+
+def single_run(fasta, motifs, both_strands):
+    """BED text of one job run on its own, the way the CLI writes it."""
+    out = io.StringIO()
+    writer = HitWriter(out, 'bed')
+    matcher = build_matcher(motifs, 'auto', both_strands)
+    for name, seq in read_fasta(fasta):
+        record = Sequence(name, seq)
+        record.motif_locations(matcher)
+        writer.write(record)
+    writer.close()
+    return out.getvalue()
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    with open(tmp_path / 'genes.fa', 'w') as f:
+        f.writelines(f'>{name}\n{seq}\n' for name, seq in RECORDS)
+    (tmp_path / 'a.txt').write_text('YGCY\nGCAUG\n')
+    (tmp_path / 'b.txt').write_text('catag\nYGCY\n')
+    return tmp_path
+
+
+def write_manifest(path, jobs, **settings):
+    path.write_text(json.dumps(dict(settings, jobs=jobs)))
+    return path
+
+
+def test_restrict_keeps_only_the_job_motifs_in_order():
+    record = Sequence('chr1 first', RECORDS[0][1])
+    record.motif_locations(build_matcher(['YGCY', 'GCAUG', 'CATAG'], 'bitmask', True))
+    view = restrict(record, ['CATAG', 'YGCY'])
+    assert list(view.hits) == list(view.minus_hits) == ['CATAG', 'YGCY']
+    assert view.hits['YGCY'] is record.hits['YGCY']
+    assert (view.seqid, view.length, view.offset) == ('chr1', record.length, 0)
+
+
+@pytest.mark.parametrize('both_strands', [False, True])
+def test_shared_fasta_jobs_match_single_runs(inputs, both_strands):
+    manifest = write_manifest(inputs / 'jobs.json', both_strands=both_strands, jobs=[
+        {'fasta': 'genes.fa', 'motifs': 'a.txt', 'plot': False, 'format': 'bed', 'output': 'a.bed'},
+        {'fasta': 'genes.fa', 'motifs': 'b.txt', 'plot': False, 'format': 'bed', 'output': 'b.bed'}])
+    settings, jobs = read_manifest(manifest)
+    written = run_batch(settings, jobs, MatcherCache())
+    assert written == [str(inputs / 'a.bed'), str(inputs / 'b.bed')]
+    assert (inputs / 'a.bed').read_text() == single_run(inputs / 'genes.fa', ['YGCY', 'GCAUG'], both_strands)
+    assert (inputs / 'b.bed').read_text() == single_run(inputs / 'genes.fa', ['CATAG', 'YGCY'], both_strands)
+
+
+def test_paths_resolve_against_the_manifest(inputs):
+    settings, jobs = read_manifest(write_manifest(inputs / 'jobs.json', jobs=[
+        {'fasta': 'genes.fa', 'motifs': 'a.txt', 'format': 'tsv'}]))
+    assert settings['matcher'] == 'auto'
+    assert jobs[0].prefix == str(inputs / 'genes_a')
+    assert jobs[0].output == str(inputs / 'genes_a.tsv')
+
+
+def test_jobs_writing_the_same_file_are_rejected(inputs):
+    (inputs / 'x').mkdir()
+    (inputs / 'y').mkdir()
+    (inputs / 'x' / 'motifs.txt').write_text('YGCY\n')
+    (inputs / 'y' / 'motifs.txt').write_text('CATAG\n')
+    manifest = write_manifest(inputs / 'jobs.json', jobs=[
+        {'fasta': 'genes.fa', 'motifs': 'x/motifs.txt'}, {'fasta': 'genes.fa', 'motifs': 'y/motifs.txt'}])
+    with pytest.raises(ValueError, match='genes_motifs.svg'):
+        read_manifest(manifest)
+    # distinct figures but one shared summary, reached through different spellings
+    manifest = write_manifest(inputs / 'jobs.json', jobs=[
+        {'fasta': 'genes.fa', 'motifs': 'a.txt', 'exon_summary': 'sum.tsv'},
+        {'fasta': 'genes.fa', 'motifs': 'b.txt', 'exon_summary': 'x/../sum.tsv'}])
+    with pytest.raises(ValueError, match='sum.tsv'):
+        read_manifest(manifest)
+    # stdout is not a file: any number of jobs may stream to it
+    manifest = write_manifest(inputs / 'jobs.json', jobs=[
+        {'fasta': 'genes.fa', 'motifs': 'a.txt', 'plot': False, 'format': 'bed', 'output': '-'},
+        {'fasta': 'genes.fa', 'motifs': 'b.txt', 'plot': False, 'format': 'bed', 'output': '-'}])
+    assert len(read_manifest(manifest)[1]) == 2
+
+
+@pytest.mark.parametrize('manifest', [
+    {'jobs': []},
+    {'matcher': 'regex', 'jobs': [{'fasta': 'genes.fa', 'motifs': 'a.txt'}]},
+    {'jobs': [{'fasta': 'genes.fa'}]},
+    {'jobs': [{'fasta': 'genes.fa', 'motifs': 'a.txt', 'plot': False}]},
+    {'jobs': [{'fasta': 'genes.fa', 'motifs': 'a.txt', 'colour': 'red'}]},
+])
+def test_bad_manifests_are_rejected(inputs, manifest):
+    (inputs / 'jobs.json').write_text(json.dumps(manifest))
+    with pytest.raises(ValueError):
+        read_manifest(inputs / 'jobs.json')
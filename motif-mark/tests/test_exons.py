@@ -0,0 +1,60 @@
+"""Exon detection from the case mask and exon/intron/junction hit tags."""
+import numpy as np
+
+from motif_mark import Sequence, classify_hits
+from motif_mark.exons import EXON, INTRON, JUNCTION
+
+
+def arrays(*pairs):
+    return np.array([p[0] for p in pairs], np.int32), np.array([p[1] for p in pairs], np.int32)
+
+
+def test_every_exon_is_found():
+    seq = Sequence('r', 'ACgtacGTNRYacgTTa')
+    starts, ends = seq.exons()
+    # ambiguous uppercase codes (N, R, Y) stay inside their exon
+    assert list(zip(starts.tolist(), ends.tolist())) == [(0, 2), (6, 11), (14, 16)]
+
+
+def test_no_or_all_exon():
+    assert Sequence('r', 'acgt').exons()[0].tolist() == []
+    starts, ends = Sequence('r', 'ACGT').exons()
+    assert (starts.tolist(), ends.tolist()) == ([0], [4])
+    assert Sequence('r', '').exons()[0].tolist() == []
+
+
+def test_classify_hits_multi_exon():
+    exon_starts, exon_ends = arrays((10, 20), (30, 40), (50, 60))
+    hits = [
+        ((0, 5), INTRON),      # before the first exon
+        ((5, 10), INTRON),     # ends exactly where the exon starts
+        ((10, 20), EXON),      # the whole exon
+        ((12, 15), EXON),
+        ((18, 22), JUNCTION),  # exon 1 into intron
+        ((20, 30), INTRON),    # fills the intron exactly
+        ((28, 32), JUNCTION),  # intron into exon 2
+        ((35, 55), JUNCTION),  # spans exon 2, the intron and exon 3
+        ((5, 65), JUNCTION),   # spans everything
+        ((59, 60), EXON),
+        ((60, 70), INTRON),    # after the last exon
+    ]
+    starts, ends = arrays(*(h for h, _ in hits))
+    assert classify_hits(starts, ends, exon_starts, exon_ends).tolist() == [tag for _, tag in hits]
+
+
+def test_classify_hits_matches_brute_force():
+    rng = np.random.default_rng(11)
+    for _ in range(100):
+        is_exon = rng.random(300) < 0.5
+        seq = Sequence('r', bytes(np.where(is_exon, ord('A'), ord('a')).astype(np.uint8)))
+        exon_starts, exon_ends = seq.exons()
+        starts = np.sort(rng.integers(0, 295, 60)).astype(np.int32)
+        ends = starts + rng.integers(1, 6, 60).astype(np.int32)
+        want = [EXON if is_exon[s:e].all() else JUNCTION if is_exon[s:e].any() else INTRON
+                for s, e in zip(starts.tolist(), ends.tolist())]
+        assert classify_hits(starts, ends, exon_starts, exon_ends).tolist() == want
+
+
+def test_classify_hits_without_exons():
+    starts, ends = arrays((0, 4), (3, 9))
+    assert classify_hits(starts, ends, *arrays()).tolist() == [INTRON, INTRON]
@@ -0,0 +1,53 @@
+"""Coordinate exports: BED/TSV are 0-based half-open, GFF3 1-based inclusive, region hits shifted by offset."""
+import io
+
+import pytest
+
+from motif_mark import HitWriter, Sequence, build_matcher
+
+SEQ = 'ttttYGCAttGCTTacatgc'
+
+
+def export(seq, fmt):
+    out = io.StringIO()
+    writer = HitWriter(out, fmt)
+    writer.write(seq)
+    writer.close()
+    return out.getvalue().splitlines()
+
+
+def scanned(name, seq, motifs, both_strands=False):
+    record = Sequence(name, seq)
+    record.motif_locations(build_matcher(motifs, 'bitmask', both_strands))
+    return record
+
+
+def test_bed_is_zero_based_half_open():
+    record = scanned('chr1 some description', SEQ, ['GCAT'], both_strands=True)
+    assert export(record, 'bed') == ['chr1\t5\t9\tGCAT\t0\t+', 'chr1\t16\t20\tGCAT\t0\t-']
+
+
+def test_gff3_is_one_based_inclusive():
+    record = scanned('chr1', SEQ, ['GCAT'])
+    assert export(record, 'gff3') == ['##gff-version 3',
+                                      'chr1\tmotif-mark\tsequence_motif\t6\t9\t.\t+\t.\tName=GCAT']
+
+
+def test_tsv_header_and_rows():
+    record = scanned('chr1', SEQ, ['GCAT', 'YGCY'])
+    assert export(record, 'tsv') == ['seqid\tmotif\tstrand\tstart\tend', 'chr1\tGCAT\t+\t5\t9',
+                                     'chr1\tYGCY\t+\t9\t13']
+
+
+@pytest.mark.parametrize('fmt', ['bed', 'gff3', 'tsv'])
+def test_region_hits_are_shifted_into_record_coordinates(fmt):
+    whole = scanned('chr1', 'a' * 1000 + SEQ, ['GCAT', 'YGCY'], both_strands=True)
+    window = scanned('chr1', SEQ, ['GCAT', 'YGCY'], both_strands=True)
+    region = Sequence.from_parts('chr1:1001-1020', window.length, window.exon_mask, window.hits,
+                                 window.minus_hits, seqid='chr1', offset=1000)
+    assert export(region, fmt) == export(whole, fmt)
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        HitWriter(io.StringIO(), 'vcf')
@@ -0,0 +1,89 @@
+"""Windowed, indexed region scans against a full in-memory scan."""
+import random
+
+import numpy as np
+import pytest
+
+from motif_mark import IndexedFasta, Sequence, build_matcher
+from motif_mark.fasta_index import parse_region
+
+MOTIFS = ['YGCY', 'CATAG', 'NNTGCATGNN']
+
+
+@pytest.fixture
+def fasta(tmp_path):
+    rng = random.Random(5)
+    records = {f'chr{i}': ''.join(rng.choice('acgtACGTn') for _ in range(rng.randint(50, 3000))) for i in range(4)}
+    path = tmp_path / 'genome.fa'
+    with open(path, 'w') as f:
+        for name, seq in records.items():
+            f.write(f'>{name} test record\n')
+            for i in range(0, len(seq), 60):
+                f.write(seq[i:i + 60] + '\n')
+    return str(path), records
+
+
+def expected(seq, matcher, start, end):
+    """Hits of a full scan of seq that lie inside [start, end), shifted to region coordinates."""
+    full = Sequence('r', seq)
+    plus, minus = matcher.scan(full.codes)
+    shift = {}
+    for name, hits in (('plus', plus), ('minus', minus)):
+        shift[name] = {}
+        for motif, (starts, ends) in hits.items():
+            keep = (starts >= start) & (ends <= end)
+            shift[name][motif] = (starts[keep] - start).tolist()
+    return shift
+
+
+@pytest.mark.parametrize('window', [8, 24, 61, 1 << 20])
+def test_windowed_scan_matches_full_scan(fasta, window):
+    path, records = fasta
+    matcher = build_matcher(MOTIFS, 'bitmask')
+    with IndexedFasta(path) as indexed:
+        for name, seq in records.items():
+            for region, start, end in ((name, 0, len(seq)), (f'{name}:11-{len(seq) - 7}', 10, len(seq) - 7)):
+                scanned = indexed.scan_region(region, matcher, window)
+                want = expected(seq, matcher, start, end)
+                assert scanned.length == end - start
+                assert scanned.offset == start
+                assert {m: h[0].tolist() for m, h in scanned.hits.items()} == want['plus']
+                is_exon = np.frombuffer(seq[start:end].encode(), np.uint8) < ord('a')
+                assert (scanned.is_exon() == is_exon).all()
+
+
+def test_fetch_reads_across_line_breaks(fasta):
+    path, records = fasta
+    with IndexedFasta(path) as indexed:
+        for name, seq in records.items():
+            assert indexed.fetch(name, 55, 130).tobytes().decode() == seq[55:130]
+
+
+@pytest.mark.parametrize('region', ['chr1:0-5', 'chr1:10-5', 'chr1:x', ''])
+def test_parse_region_rejects_bad_regions(region):
+    with pytest.raises(ValueError):
+        parse_region(region)
+
+
+def test_unknown_record_is_a_value_error(fasta):
+    path, _ = fasta
+    with IndexedFasta(path) as indexed, pytest.raises(ValueError):
+        indexed.region_bounds('chrX:1-10')
+
+
+def test_record_names_containing_colons(tmp_path):
+    path = tmp_path / 'hla.fa'
+    path.write_text('>HLA-A*01:01 allele\nacgtCGCTac\ngtGCTT\n>HLA-A*01\nTTTT\n')
+    matcher = build_matcher(['YGCY'], 'bitmask')
+    assert parse_region('HLA-A*01:01:3-8') == ('HLA-A*01:01', 2, 8)
+    with IndexedFasta(str(path)) as indexed:
+        # the whole name is a record, so ':01' is not read as a start position on HLA-A*01
+        assert indexed.region_bounds('HLA-A*01:01') == ('HLA-A*01:01', 0, 16)
+        assert indexed.region_bounds('HLA-A*01:01:3-8') == ('HLA-A*01:01', 2, 8)
+        assert indexed.region_bounds('HLA-A*01:2') == ('HLA-A*01', 1, 4)
+        whole = indexed.scan_region('HLA-A*01:01', matcher)
+        assert (whole.name, whole.seqid, whole.offset) == ('HLA-A*01:01', 'HLA-A*01:01', 0)
+        assert whole.hits['YGCY'][0].tolist() == [4, 11]
+        part = indexed.scan_region('HLA-A*01:01:3-10', matcher)
+        assert (part.name, part.seqid, part.offset) == ('HLA-A*01:01:3-10', 'HLA-A*01:01', 2)
+        assert part.hits['YGCY'][0].tolist() == [2]
@@ -0,0 +1,59 @@
+"""Streaming FASTA reader: record boundaries and gzip/bgzip input."""
+import gzip
+
+import pytest
+
+from motif_mark import read_fasta
+
+RECORDS = [('MBNL chr3:152446461-152447003', 'tgtaattaACTG' * 10 + 'ac'),
+           ('INSR chr19:7150261-7150808 (reverse complement)', 'GGCTAgct'),
+           ('empty', '')]
+
+
+def write_fasta(path, records, width=7, opener=open):
+    with opener(path, 'wt') as f:
+        for name, seq in records:
+            f.write(f'>{name}\n')
+            for i in range(0, len(seq), width):
+                f.write(seq[i:i + width] + '\n')
+
+
+def test_reads_every_line_of_every_record(tmp_path):
+    path = tmp_path / 'plain.fa'
+    write_fasta(path, RECORDS)
+    # the first sequence line after each header is kept
+    assert list(read_fasta(path)) == RECORDS
+
+
+def test_crlf_and_blank_lines(tmp_path):
+    path = tmp_path / 'dos.fa'
+    path.write_bytes(b'>a desc\r\nACGT\r\n\r\nacgt\r\n>b\r\nNN\r\n')
+    assert list(read_fasta(path)) == [('a desc', 'ACGTacgt'), ('b', 'NN')]
+
+
+def test_gzip_input(tmp_path):
+    path = tmp_path / 'reads.fa.gz'
+    write_fasta(path, RECORDS, opener=gzip.open)
+    assert list(read_fasta(path)) == RECORDS
+
+
+def test_bgzip_style_multi_member_input(tmp_path):
+    # bgzip writes a series of independent gzip members
+    path = tmp_path / 'reads.fa.bgz'
+    with open(path, 'wb') as f:
+        f.write(gzip.compress(b'>a\nACGT\nAC'))
+        f.write(gzip.compress(b'GT\n>b\nTTTT\n'))
+    assert list(read_fasta(path)) == [('a', 'ACGTACGT'), ('b', 'TTTT')]
+
+
+def test_sequence_before_header_is_an_error(tmp_path):
+    path = tmp_path / 'bad.fa'
+    path.write_text('ACGT\n>a\nACGT\n')
+    with pytest.raises(ValueError):
+        list(read_fasta(path))
+
+
+def test_empty_file(tmp_path):
+    path = tmp_path / 'empty.fa'
+    path.write_text('')
+    assert list(read_fasta(path)) == []
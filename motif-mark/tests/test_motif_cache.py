@@ -0,0 +1,82 @@
+"""Compiled-matcher cache: key normalization, the two layers, corrupt entries and eviction."""
+import os
+
+from motif_mark import MatcherCache, build_matcher
+from motif_mark.motif_cache import matcher_key
+
+MOTIFS = ['YGCY', 'GCAUG']
+
+
+class Builds:
+    """build() callback that counts how often the cache had to compile."""
+
+    def __init__(self, motifs=MOTIFS, kind='bitmask'):
+        self.motifs, self.kind, self.calls = motifs, kind, 0
+
+    def __call__(self):
+        self.calls += 1
+        return build_matcher(self.motifs, self.kind)
+
+
+def pickles(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith('.pickle'))
+
+
+def test_key_normalizes_case_and_whitespace():
+    assert matcher_key(['ygcy ', 'GCAUG'], 'bitmask') == matcher_key(MOTIFS, 'bitmask')
+    assert matcher_key(MOTIFS, 'bitmask', True) == matcher_key(MOTIFS, 'bitmask', 1)
+
+
+def test_key_depends_on_kind_strands_and_order():
+    keys = {matcher_key(MOTIFS, 'bitmask'), matcher_key(MOTIFS, 'automaton'),
+            matcher_key(MOTIFS, 'bitmask', True), matcher_key(MOTIFS[::-1], 'bitmask')}
+    assert len(keys) == 4
+
+
+def test_memory_layer_returns_the_same_matcher():
+    cache, build = MatcherCache(), Builds()
+    first = cache.get(MOTIFS, 'bitmask', False, build)
+    assert cache.get(MOTIFS, 'bitmask', False, build) is first
+    assert build.calls == 1 and len(cache) == 1
+
+
+def test_memory_layer_is_bounded():
+    cache = MatcherCache(max_entries=2)
+    for motif in ['A', 'C', 'G']:
+        cache.get([motif], 'bitmask', False, Builds([motif]))
+    assert len(cache) == 2
+    build = Builds(['A'])
+    cache.get(['A'], 'bitmask', False, build)
+    assert build.calls == 1
+
+
+def test_disk_layer_is_shared_between_caches(tmp_path):
+    build = Builds()
+    MatcherCache(tmp_path).get(MOTIFS, 'bitmask', False, build)
+    matcher = MatcherCache(tmp_path).get(MOTIFS, 'bitmask', False, build)
+    assert build.calls == 1
+    assert matcher.motifs == MOTIFS
+    assert pickles(tmp_path) == [matcher_key(MOTIFS, 'bitmask', False) + '.pickle']
+
+
+def test_corrupt_entry_is_rebuilt(tmp_path):
+    MatcherCache(tmp_path).get(MOTIFS, 'bitmask', False, Builds())
+    path = tmp_path / pickles(tmp_path)[0]
+    path.write_bytes(path.read_bytes()[:10])
+    build = Builds()
+    assert MatcherCache(tmp_path).get(MOTIFS, 'bitmask', False, build).motifs == MOTIFS
+    assert build.calls == 1
+    assert MatcherCache(tmp_path).get(MOTIFS, 'bitmask', False, build).motifs == MOTIFS
+    assert build.calls == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    size = None
+    for age, motif in enumerate(['AAAA', 'CCCC', 'GGGG']):
+        MatcherCache(tmp_path).get([motif], 'bitmask', False, Builds([motif]))
+        key = matcher_key([motif], 'bitmask')
+        os.utime(tmp_path / f'{key}.pickle', (100 + age, 100 + age))
+        size = os.path.getsize(tmp_path / f'{key}.pickle')
+    # room for two entries: storing a fourth drops the oldest
+    MatcherCache(tmp_path, max_bytes=2 * size + size // 2).get(['TTTT'], 'bitmask', False, Builds(['TTTT']))
+    assert pickles(tmp_path) == sorted(matcher_key([m], 'bitmask') + '.pickle' for m in ['GGGG', 'TTTT'])
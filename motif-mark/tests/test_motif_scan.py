@@ -0,0 +1,100 @@
+"""Both matchers against a regex reference over every expanded motif variant."""
+import os
+import random
+import re
+
+import numpy as np
+import pytest
+
+from motif_mark import BitmaskMatcher, Sequence, build_matcher, expand_motif, read_fasta, read_motifs
+from motif_mark.motifs import choose_matcher
+from motif_mark.motif_scan import reverse_complement
+
+SCRIPT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Script')
+MATCHERS = ['automaton', 'bitmask']
+
+
+def regex_starts(seq, motif):
+    """Sorted start of every (overlapping) match of any variant of motif in seq, reading U as T."""
+    seq = seq.upper().replace('U', 'T')
+    variants = {variant.replace('U', 'T') for variant in expand_motif(motif)}
+    return sorted(m.start() for variant in variants for m in re.finditer(f'(?={variant})', seq))
+
+
+def check_hits(seq, motifs, matcher, both_strands=False):
+    plus, minus = matcher.scan(Sequence('r', seq).codes)
+    assert list(plus) == motifs
+    for motif in motifs:
+        starts, ends = plus[motif]
+        assert starts.tolist() == regex_starts(seq, motif)
+        assert (ends - starts == len(motif)).all()
+        if both_strands:
+            assert minus[motif][0].tolist() == regex_starts(seq, reverse_complement(motif))
+    if not both_strands:
+        assert minus == {}
+
+
+def random_case(rng):
+    motifs = list(dict.fromkeys(''.join(rng.choice('ACGTUNRYWSKM') for _ in range(rng.randint(1, 6)))
+                                for _ in range(rng.randint(1, 5))))
+    seq = ''.join(rng.choice('acgtunACGTUN') for _ in range(rng.randint(0, 400)))
+    return motifs, seq
+
+
+@pytest.mark.parametrize('kind', MATCHERS)
+@pytest.mark.parametrize('both_strands', [False, True])
+def test_figure_1_matches_regex(kind, both_strands):
+    motifs = read_motifs(os.path.join(SCRIPT_DIR, 'Fig_1_motifs.txt'))
+    matcher = build_matcher(motifs, kind, both_strands)
+    for _, seq in read_fasta(os.path.join(SCRIPT_DIR, 'Figure_1.fasta')):
+        check_hits(seq, motifs, matcher, both_strands)
+
+
+@pytest.mark.parametrize('kind', MATCHERS)
+@pytest.mark.parametrize('both_strands', [False, True])
+def test_random_inputs_match_regex(kind, both_strands):
+    rng = random.Random(7)
+    for _ in range(40):
+        motifs, seq = random_case(rng)
+        check_hits(seq, motifs, build_matcher(motifs, kind, both_strands), both_strands)
+
+
+def test_u_reads_as_t_on_both_strands():
+    seq = 'ttGCATGaaCATGCccGCAUG'
+    for kind in MATCHERS:
+        plus, minus = build_matcher(['GCAUG'], kind, True).scan(Sequence('r', seq).codes)
+        assert plus['GCAUG'][0].tolist() == [2, 16]
+        assert minus['GCAUG'][0].tolist() == [9]
+
+
+def test_matchers_agree():
+    motifs = ['YGCY', 'GCAUG', 'NNNNCATAG']
+    rng = np.random.default_rng(3)
+    codes = Sequence('r', rng.choice(list(b'acgtACGTN'), 5000).tobytes()).codes
+    automaton, bitmask = (build_matcher(motifs, kind, True).scan(codes) for kind in MATCHERS)
+    for motif in motifs:
+        assert automaton[0][motif][0].tolist() == bitmask[0][motif][0].tolist()
+        assert automaton[1][motif][0].tolist() == bitmask[1][motif][0].tolist()
+
+
+@pytest.mark.parametrize('kind', MATCHERS)
+def test_lowercase_motifs(kind):
+    plus, _ = build_matcher(['ygcy', 'GCAUG', 'gcaug'], kind).scan(Sequence('r', 'ttGCTTgcatg').codes)
+    assert {m: h[0].tolist() for m, h in plus.items()} == {'YGCY': [1], 'GCAUG': [6]}
+
+
+def test_invalid_iupac_code():
+    with pytest.raises(ValueError):
+        build_matcher(['ACZ'], 'automaton')
+    with pytest.raises(ValueError):
+        build_matcher(['ACZ'], 'bitmask')
+
+
+def test_auto_keeps_n_heavy_motif_sets_on_the_bitmask_matcher():
+    rng = random.Random(11)
+    plain = [''.join(rng.choice('ACGT') for _ in range(16)) for _ in range(32)]
+    # 528 positions: past the bitmask size limit, but the N run expands to 67M variants
+    assert choose_matcher(plain + ['ACGTACGTACGTYGCY']) == 'automaton'
+    assert choose_matcher(plain + ['NNNNNNNNNNNNYGCY']) == 'bitmask'
+    assert choose_matcher(plain + ['NNNNNNNNNNNNYGCY'], both_strands=True) == 'bitmask'
+    assert isinstance(build_matcher(plain + ['NNNNNNNNNNNNYGCY']), BitmaskMatcher)
@@ -0,0 +1,28 @@
+"""Level-of-detail helpers: exon rectangles stay bounded by the track width."""
+import numpy as np
+
+from motif_mark.exons import exon_intervals
+from motif_mark.render import exon_rectangles
+
+
+def test_short_records_draw_one_rectangle_per_exon():
+    xs, widths = exon_rectangles(np.array([2, 10], dtype=np.int32), np.array([5, 11], dtype=np.int32), 20, 1050)
+    assert xs.tolist() == [2, 10] and widths.tolist() == [3, 1]
+
+
+def test_long_records_merge_exons_per_pixel_column():
+    rng = np.random.default_rng(2)
+    is_exon = np.repeat(rng.random(100_000) < 0.5, rng.integers(1, 50, 100_000))
+    starts, ends = exon_intervals(is_exon)
+    pixels = 1050
+    xs, widths = exon_rectangles(starts, ends, len(is_exon), pixels)
+    assert len(starts) > 10 * pixels
+    assert len(xs) <= pixels
+    assert xs.min() >= 0 and (xs + widths).max() <= pixels
+    # every pixel column holding an exonic base is covered, and no other
+    covered = np.zeros(pixels, dtype=bool)
+    for x, w in zip(xs.astype(int), widths.astype(int)):
+        covered[x:x + w] = True
+    want = np.zeros(pixels, dtype=bool)
+    want[np.flatnonzero(is_exon) * pixels // len(is_exon)] = True
+    assert (covered == want).all()
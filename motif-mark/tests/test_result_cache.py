@@ -0,0 +1,70 @@
+"""SQLite result cache: reruns scan only the record x motif pairs they have not seen."""
+import numpy as np
+import pytest
+
+from motif_mark import CachedScanner, Sequence, build_matcher
+
+
+class Subsets:
+    """build(motifs) callback recording which motif subsets had to be scanned."""
+
+    def __init__(self, both_strands):
+        self.both_strands, self.built = both_strands, []
+
+    def __call__(self, motifs):
+        self.built.append(motifs)
+        return build_matcher(motifs, 'bitmask', self.both_strands)
+
+
+def starts(hits):
+    return {motif: h[0].tolist() for motif, h in hits.items()}
+
+
+@pytest.fixture
+def codes():
+    rng = np.random.default_rng(5)
+    return [Sequence(f'r{i}', rng.choice(list(b'acgtACGT'), 2000).tobytes()).codes for i in range(3)]
+
+
+def cached(motifs, subsets, db_path):
+    return CachedScanner(build_matcher(motifs, 'bitmask', subsets.both_strands), subsets, db_path)
+
+
+@pytest.mark.parametrize('both_strands', [False, True])
+def test_cached_hits_match_a_direct_scan(tmp_path, codes, both_strands):
+    motifs = ['YGCY', 'GCAUG', 'CATAG']
+    direct = build_matcher(motifs, 'bitmask', both_strands)
+    for _ in range(2):  # cold, then answered from the database
+        scanner = cached(motifs, Subsets(both_strands), tmp_path / 'hits.sqlite')
+        for c in codes:
+            plus, minus = scanner.scan(c)
+            want_plus, want_minus = direct.scan(c)
+            assert list(plus) == motifs
+            assert starts(plus) == starts(want_plus)
+            assert starts(minus) == starts(want_minus)
+            assert all((h[1] - h[0] == len(m)).all() for m, h in plus.items())
+
+
+@pytest.mark.parametrize('both_strands', [False, True])
+def test_adding_a_motif_scans_only_the_new_motif(tmp_path, codes, both_strands):
+    db_path = tmp_path / 'hits.sqlite'
+    first = Subsets(both_strands)
+    scanner = cached(['YGCY', 'GCAUG'], first, db_path)
+    for c in codes:
+        scanner.scan(c)
+    assert first.built == []  # the wrapped scanner covered every motif
+
+    second = Subsets(both_strands)
+    scanner = cached(['YGCY', 'CATAG', 'GCAUG'], second, db_path)
+    for c in codes:
+        plus, minus = scanner.scan(c)
+        assert list(plus) == ['YGCY', 'CATAG', 'GCAUG']
+    assert second.built == [['CATAG']]
+
+
+def test_minus_strand_run_rescans_plus_only_rows(tmp_path, codes):
+    db_path = tmp_path / 'hits.sqlite'
+    plus_only = cached(['YGCY'], Subsets(False), db_path)
+    plus_only.scan(codes[0])
+    plus, minus = cached(['YGCY'], Subsets(True), db_path).scan(codes[0])
+    assert starts(minus) == starts(build_matcher(['YGCY'], 'bitmask', True).scan(codes[0])[1])
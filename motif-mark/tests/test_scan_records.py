@@ -0,0 +1,18 @@
+"""Process-pool scanning returns the same records, in input order, as a serial scan."""
+import random
+
+from motif_mark import Sequence, build_matcher, scan_records
+
+
+def hits_of(scanned):
+    return [(seq.name, {m: hits[0].tolist() for m, hits in seq.hits.items()}) for seq in scanned]
+
+
+def test_parallel_scan_keeps_input_order():
+    rng = random.Random(1)
+    records = [(f'r{i}', ''.join(rng.choice('acgtACGT') for _ in range(rng.randint(0, 300)))) for i in range(200)]
+    matcher = build_matcher(['YGCY', 'CATAG'])
+    serial = hits_of(scan_records((Sequence(*r) for r in records), matcher))
+    parallel = hits_of(scan_records((Sequence(*r) for r in records), matcher, workers=3, chunksize=7))
+    assert parallel == serial
+    assert [name for name, _ in parallel] == [name for name, _ in records]